@@ -0,0 +1,83 @@
+# Class to define a uniform grid spatial hash of sprite hitboxes, used as a
+# broadphase so that only sprites sharing a grid cell are passed on to
+# Sprite.collide_check. Sprites in the hash report their own moves, so
+# cells are only updated when a hitbox crosses into a different cell.
+class SpatialHash:
+    def __init__(self, cell_size):
+        self.cell_size = max(1, int(cell_size))
+        self.cells = {}
+        self.sprite_cells = {}
+        self.order = {}
+        self.next_order = 0
+
+    # Method to get the range of cells covered by a rect
+    def get_cell_range(self, rect):
+        left, top, width, height = rect
+        return (
+            left // self.cell_size,
+            top // self.cell_size,
+            (left + max(width, 1) - 1) // self.cell_size,
+            (top + max(height, 1) - 1) // self.cell_size,
+        )
+
+    # Method to add a sprite to the hash, which then reports its moves
+    def insert(self, sprite):
+        if sprite in self.sprite_cells:
+            return
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+        cell_range = self.get_cell_range(sprite.hitbox_rect)
+        self.sprite_cells[sprite] = cell_range
+        self._add_to_cells(sprite, cell_range)
+        sprite.spatial_hash = self
+
+    # Method to remove a sprite from the hash
+    def remove(self, sprite):
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+        self._remove_from_cells(sprite, cell_range)
+        del self.order[sprite]
+        sprite.spatial_hash = None
+
+    # Method to move a sprite to new cells if its hitbox changed cells
+    def update(self, sprite):
+        cell_range = self.get_cell_range(sprite.hitbox_rect)
+        old_cell_range = self.sprite_cells.get(sprite)
+        if cell_range == old_cell_range or old_cell_range is None:
+            return
+        self._remove_from_cells(sprite, old_cell_range)
+        self._add_to_cells(sprite, cell_range)
+        self.sprite_cells[sprite] = cell_range
+
+    # Method to get sprites sharing a cell with any of the given rects,
+    # in insertion order
+    def query(self, *rects):
+        candidates = set()
+        for rect in rects:
+            x_min, y_min, x_max, y_max = self.get_cell_range(rect)
+            for x in range(x_min, x_max + 1):
+                for y in range(y_min, y_max + 1):
+                    cell = self.cells.get((x, y))
+                    if cell:
+                        candidates.update(cell)
+        if len(candidates) > 1:
+            return sorted(candidates, key=self.order.__getitem__)
+        return list(candidates)
+
+    # Helper method to add a sprite to each cell within a range
+    def _add_to_cells(self, sprite, cell_range):
+        x_min, y_min, x_max, y_max = cell_range
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                self.cells.setdefault((x, y), set()).add(sprite)
+
+    # Helper method to remove a sprite from each cell within a range
+    def _remove_from_cells(self, sprite, cell_range):
+        x_min, y_min, x_max, y_max = cell_range
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                cell = self.cells[(x, y)]
+                cell.discard(sprite)
+                if not cell:
+                    del self.cells[(x, y)]
@@ -5,6 +5,14 @@ from asset.sprite import Sprite
 
 # Class to define a sprite and its methods
 class Enemy(Sprite):
+    __slots__ = (
+        "is_invincible",
+        "path_finding",
+        "seen_player",
+        "swarm_slot",
+        "registry",
+    )
+
     def __init__(
         self,
         name,
@@ -32,29 +40,63 @@ class Enemy(Sprite):
         # Additional attributes
         self.path_finding = False
         self.seen_player = False
+        self.swarm_slot = None
+        self.registry = None
 
     # Method to check if the enemy can move within maze
     # in the direction of a second sprite, and that a clear
     # path exists between the two. If true, returns the direction
-    # to be traversed by the enemy.
-    def can_see_player(self, second_sprite: "Sprite", barrier_sprites, maze_grid):
+    # to be traversed by the enemy. If a sightline index is given, its
+    # segment and barrier lookups and per-tick cache are used instead of
+    # scanning the grid and each barrier.
+    def can_see_player(
+        self, second_sprite: "Sprite", barrier_sprites, maze_grid, sightline_index
+    ):
+        if sightline_index:
+            cache_key = (
+                self.center_x,
+                self.center_y,
+                second_sprite.center_x,
+                second_sprite.center_y,
+                self.path_width,
+            )
+            cached_direction = sightline_index.sight_cache.get(cache_key)
+            if cached_direction is not None:
+                return cached_direction
+            move_direction = self._find_sightline(
+                second_sprite, barrier_sprites, maze_grid, sightline_index
+            )
+            sightline_index.sight_cache[cache_key] = move_direction
+            return move_direction
+        return self._find_sightline(second_sprite, barrier_sprites, maze_grid, None)
+
+    # Helper method for can_see_player to check the sightline rect
+    def _find_sightline(
+        self, second_sprite: "Sprite", barrier_sprites, maze_grid, sightline_index
+    ):
         aligned_horz = False
         aligned_vert = False
+        # No direction to move if already at the second sprite
+        if (self.center_x, self.center_y) == (
+            second_sprite.center_x,
+            second_sprite.center_y,
+        ):
+            return ()
         # Check if aligned horizontally with second sprite (same y)
-        if self.center_position[1] == second_sprite.center_position[1]:
+        if self.center_y == second_sprite.center_y:
             # Move towards second sprite either right or left
             aligned_horz = True
-            if self.center_position[0] < second_sprite.center_position[0]:
+            if self.center_x < second_sprite.center_x:
                 move_direction = (1, 0)
-            elif self.center_position[0] > second_sprite.center_position[0]:
+            elif self.center_x > second_sprite.center_x:
                 move_direction = (-1, 0)
         # Otherwise check if aligned vertically with second sprite (same x)
-        elif self.center_position[0] == second_sprite.center_position[0]:
+        elif self.center_x == second_sprite.center_x:
             # Move towards second sprite either up or down
             aligned_vert = True
-            if self.center_position[1] > second_sprite.center_position[1]:
+            if self.center_y > second_sprite.center_y:
                 move_direction = (0, -1)
-            elif self.center_position[1] < second_sprite.center_position[1]:
+            elif self.center_y < second_sprite.center_y:
                 move_direction = (0, 1)
 
         # Form a horizontal rect between the two for checking
@@ -83,17 +125,34 @@ class Enemy(Sprite):
 
         # Check if temp rect resides within a clear space within maze path
         temp_rect = pygame.Rect(temp_topleft_x, temp_topleft_y, temp_width, temp_height)
-        if Sprite.is_path_clear(temp_rect, maze_grid):
-            for barrier in barrier_sprites:
-                if barrier_sprites[barrier].hitbox_rect.colliderect(temp_rect):
-                    return ()
-            return move_direction
-        return ()
+        if sightline_index:
+            path_clear = sightline_index.is_span_clear(temp_rect, move_direction)
+        else:
+            path_clear = Sprite.is_path_clear(temp_rect, maze_grid)
+        if not path_clear:
+            return ()
+
+        # Check if temp rect is blocked by a barrier such as an item
+        if sightline_index:
+            path_blocked = sightline_index.is_span_blocked(temp_rect, move_direction)
+        else:
+            path_blocked = any(
+                barrier_sprites[barrier].hitbox_rect.colliderect(temp_rect)
+                for barrier in barrier_sprites
+            )
+        if path_blocked:
+            return ()
+        return move_direction
 
     # Move towards second sprite if direction possible,
     # otherwise random navigation, only backtracking if needed
     def set_navigate_direction(
-        self, second_sprite: "Sprite", barrier_sprites, maze_grid, game_tick
+        self,
+        second_sprite: "Sprite",
+        barrier_sprites,
+        maze_grid,
+        game_tick,
+        sightline_index,
     ):
         # Determine how far item has traveled in the game tick
         if self.move_dist + self.speed * game_tick >= 1:
@@ -103,33 +162,25 @@ class Enemy(Sprite):
             # Check if possible to move towards second sprite with clear path
             if second_sprite and not self.has_seen_player():
                 move_dir = self.can_see_player(
-                    second_sprite, barrier_sprites, maze_grid
+                    second_sprite, barrier_sprites, maze_grid, sightline_index
                 )
                 if move_dir:
                     self.set_desired_direction(move_dir[0], move_dir[1])
                     self.seen_player = True
 
             # If current direction is 0, 0, choose a random direction
-            if self.desired_direction == (0, 0) or not self.desired_direction:
+            if not self.has_desired or (self.desired_x == 0 and self.desired_y == 0):
                 rand_direction = dirs[random.randint(0, 3)]
                 self.set_desired_direction(rand_direction[0], rand_direction[1])
 
             # Check current direction, then orthogonal directions, then reverse
-            reverse_direction = (
-                -1 * self.desired_direction[0],
-                -1 * self.desired_direction[1],
-            )
-            orthog_direction_1 = (self.desired_direction[1], self.desired_direction[0])
-            orthog_direction_2 = (
-                -1 * self.desired_direction[1],
-                -1 * self.desired_direction[0],
-            )
-
+            desired_x = self.desired_x
+            desired_y = self.desired_y
             directions_to_check = [
-                self.desired_direction,
-                orthog_direction_1,
-                orthog_direction_2,
-                reverse_direction,
+                (desired_x, desired_y),
+                (desired_y, desired_x),
+                (-desired_y, -desired_x),
+                (-desired_x, -desired_y),
             ]
             valid_indices = []
             for index, direction in enumerate(directions_to_check):
@@ -155,6 +206,18 @@ class Enemy(Sprite):
                     directions_to_check[chosen_index][1],
                 )
 
+    # Set flag to destroy enemy, updating the registry views
+    def toggle_destroy(self):
+        super().toggle_destroy()
+        if self.registry:
+            self.registry.update(self)
+
+    # Set flag to prevent respawn, updating the registry views
+    def toggle_spawn(self):
+        super().toggle_spawn()
+        if self.registry:
+            self.registry.update(self)
+
     # Pathfind based on current flow field
     def set_pathfind_direction(self, flow_field, enemy_graph_coord):
         flow_field_direction = flow_field[enemy_graph_coord]
@@ -4,6 +4,8 @@ from asset.sprite import Sprite
 
 # Class to define a sprite and its methods
 class Player(Sprite):
+    __slots__ = ()
+
     def __init__(
         self, name, image, center_position, speed, can_rotate, hitbox_width, path_width, rotate_image
     ):
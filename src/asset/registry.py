@@ -0,0 +1,41 @@
+# Class to keep views of a level's enemies up to date as they spawn and are
+# destroyed, so the game loop does not rebuild them every tick. Enemies in
+# the registry report their own spawn and destroy changes. Views keep the
+# enemy order (corns, then tomatoes, then pumpkins) which spawning relies on.
+class EnemyRegistry:
+    def __init__(self, corns, tomatoes, pumpkins):
+        self.all_enemies = corns + tomatoes + pumpkins
+        self.order = {enemy: index for index, enemy in enumerate(self.all_enemies)}
+        self.alive_enemies = []
+        self.active_enemies = []
+        # Count starts with all enemies out of the alive view until placed
+        self.num_destroyed = len(self.all_enemies)
+        for enemy in self.all_enemies:
+            enemy.registry = self
+            self.update(enemy)
+
+    # Method to place an enemy in the views matching its current state
+    def update(self, enemy):
+        is_alive = not enemy.is_destroyed()
+        was_alive = self._place(self.alive_enemies, enemy, is_alive)
+        if was_alive != is_alive:
+            self.num_destroyed += 1 if was_alive else -1
+        self._place(self.active_enemies, enemy, is_alive and enemy.can_spawn())
+
+    # Method to return whether every enemy of the level has been destroyed
+    def all_destroyed(self):
+        return self.num_destroyed == len(self.all_enemies)
+
+    # Helper method to add or remove an enemy from an ordered view,
+    # returning whether the enemy was previously in the view
+    def _place(self, view, enemy, include):
+        enemy_order = self.order[enemy]
+        index = 0
+        while index < len(view) and self.order[view[index]] < enemy_order:
+            index += 1
+        present = index < len(view) and view[index] is enemy
+        if include and not present:
+            view.insert(index, enemy)
+        elif present and not include:
+            del view[index]
+        return present
@@ -1,10 +1,50 @@
 import pygame
 import time
+from bisect import bisect_right
 from rect.utils import define_rect
 
 
-# Class to define a sprite and its methods
+# Class to define a sprite and its methods. Positions and directions are
+# stored as separate ints in slots, so that moves do not allocate tuples.
 class Sprite:
+    __slots__ = (
+        "name",
+        "image",
+        "center_x",
+        "center_y",
+        "speed",
+        "can_rotate",
+        "hitbox_width",
+        "path_width",
+        "rotate_image",
+        "orig_image",
+        "got_stopped",
+        "move_dist",
+        "facing",
+        "spawn",
+        "destroyed",
+        "spatial_hash",
+        "hitbox_rect",
+        "path_rect",
+        "rotation_angle",
+        "mirror",
+        "direction_x",
+        "direction_y",
+        "has_desired",
+        "desired_x",
+        "desired_y",
+        "motion_x",
+        "motion_y",
+        "animation_start_time",
+        "animation_delays",
+        "animation_images",
+        "animation_index",
+        "dirty",
+    )
+
+    # Compiled animation timelines, keyed by (image names, time delays)
+    timelines = {}
+
     def __init__(
         self,
         name,
@@ -18,7 +58,7 @@ class Sprite:
     ):
         self.name = name
         self.image = image
-        self.center_position = center_position
+        self.center_x, self.center_y = center_position
         self.speed = speed  # pixels per game tick
         self.can_rotate = can_rotate
         self.hitbox_width = hitbox_width
@@ -32,54 +72,118 @@ class Sprite:
         self.facing = "right"
         self.spawn = False
         self.destroyed = False
+        self.spatial_hash = None
         self._initialize_attributes()
 
     # Initialization of more attributes
     def _initialize_attributes(self):
         self.hitbox_rect = define_rect(self.center_position, self.hitbox_width)
         self.path_rect = define_rect(self.center_position, self.path_width)
+        self._initialize_motion()
+
+    # Initialization of orientation, direction, and animation attributes
+    def _initialize_motion(self):
+        self.dirty = True  # whether appearance changed since last drawn
         self.rotation_angle = 0  # + counterclockwise
         self.mirror = False
-        self.direction = (0, 0)
-        self.desired_direction = ()
-        self.motion_vector = (0, 0)
+        self.direction_x = 0
+        self.direction_y = 0
+        self.has_desired = False
+        self.desired_x = 0
+        self.desired_y = 0
+        self.motion_x = 0
+        self.motion_y = 0
         self.animation_start_time = None
-        self.animation_sequence = []
+        self.animation_delays = ()
+        self.animation_images = ()
         self.animation_index = 0
 
+    # Center position as a tuple
+    @property
+    def center_position(self):
+        return (self.center_x, self.center_y)
+
+    # Direction as a tuple
+    @property
+    def direction(self):
+        return (self.direction_x, self.direction_y)
+
+    # Desired direction as a tuple, or empty if none commanded yet
+    @property
+    def desired_direction(self):
+        if self.has_desired:
+            return (self.desired_x, self.desired_y)
+        return ()
+
+    # Motion vector as a tuple
+    @property
+    def motion_vector(self):
+        return (self.motion_x, self.motion_y)
+
     # Method to perform reset to absolulte location
     def reset(self, x, y):
-        self.center_position = (x, y)
+        self.center_x = x
+        self.center_y = y
         self._initialize_attributes()
+        if self.spatial_hash:
+            self.spatial_hash.update(self)
+
+    # Method to restore a sprite for reuse with new properties,
+    # resizing and moving its existing Rect objects in place
+    def recycle(
+        self,
+        image,
+        center_position,
+        speed,
+        can_rotate,
+        hitbox_width,
+        path_width,
+        rotate_image,
+    ):
+        self.image = image
+        self.center_x, self.center_y = center_position
+        self.speed = speed
+        self.can_rotate = can_rotate
+        self.hitbox_width = hitbox_width
+        self.path_width = path_width
+        self.rotate_image = rotate_image
+        self.orig_image = image
+        self.got_stopped = False
+        self.move_dist = 0
+        self.facing = "right"
+        self.spawn = False
+        self.destroyed = False
+        self.hitbox_rect.width = self.hitbox_rect.height = hitbox_width
+        self.hitbox_rect.center = center_position
+        self.path_rect.width = self.path_rect.height = path_width
+        self.path_rect.center = center_position
+        self._initialize_motion()
+        if self.spatial_hash:
+            self.spatial_hash.update(self)
 
     # Method to perform shifting to desired location
     def shift(self, delta_x, delta_y):
         self.hitbox_rect.move_ip(delta_x, delta_y)
         self.path_rect.move_ip(delta_x, delta_y)
-        self.center_position = (
-            self.center_position[0] + delta_x,
-            self.center_position[1] + delta_y,
-        )
+        self.center_x += delta_x
+        self.center_y += delta_y
+        self.dirty = True
+        if self.spatial_hash:
+            self.spatial_hash.update(self)
 
     # Method to move the sprite with associated motion vector and orientation operations
     def move(self, delta_x, delta_y):
         if delta_x != 0 or delta_y != 0:
-            # Initialize flag, only to be used if motion vector changes
-            orientation_check = False
             # Determine signs of deltas
-            delta_signs = [0, 0]
-            delta_signs[0] = 1 if delta_x > 0 else (-1 if delta_x < 0 else 0)
-            delta_signs[1] = 1 if delta_y > 0 else (-1 if delta_y < 0 else 0)
+            sign_x = 1 if delta_x > 0 else (-1 if delta_x < 0 else 0)
+            sign_y = 1 if delta_y > 0 else (-1 if delta_y < 0 else 0)
             # Check orientation if new motion is different
-            if (
-                self.motion_vector[0] != delta_signs[0]
-                or self.motion_vector[1] != delta_signs[1]
-            ):
-                orientation_check = True
+            orientation_check = self.motion_x != sign_x or self.motion_y != sign_y
             # Shift Rect objects and position
             self.shift(delta_x, delta_y)
             # Set new motion vector
-            self.set_motion_vector(delta_signs[0], delta_signs[1])
+            self.motion_x = sign_x
+            self.motion_y = sign_y
             # Determine new orientation if motion vector changed
             if self.can_rotate and orientation_check:
                 self.set_orientation()
@@ -174,7 +278,8 @@ class Sprite:
         self.move_dist += self.speed * game_tick
 
         # Original position to be checked later
-        orig_position = (self.center_position[0], self.center_position[1])
+        orig_x = self.center_x
+        orig_y = self.center_y
 
         # If threshold of 1 pixel reached, do move
         if self.move_dist >= 1:
@@ -186,48 +291,43 @@ class Sprite:
             do_move = False
 
         # If nonzero direction was commanded and is possible, move
-        if self.desired_direction and self.can_move(
-            self.desired_direction[0], self.desired_direction[1], maze_grid
+        if self.has_desired and self.can_move(
+            self.desired_x, self.desired_y, maze_grid
         ):
             # Don't override current direction if commanded was (0, 0),
             # that way previous direction can be attempted if the next
             # commanded direction is not possible
-            if self.desired_direction == (0, 0):
+            if self.desired_x == 0 and self.desired_y == 0:
                 self.move(0, 0)
             else:
-                self.set_direction(self.desired_direction[0], self.desired_direction[1])
+                self.direction_x = self.desired_x
+                self.direction_y = self.desired_y
                 if do_move:
                     # Move delta_dist, or max possible if that is too far
                     for i in range(delta_dist, 0, -1):
                         max_dist = i
                         if self.can_move(
-                            i * self.direction[0], i * self.direction[1], maze_grid
+                            i * self.direction_x, i * self.direction_y, maze_grid
                         ):
                             break
-                    self.move(
-                        max_dist * self.direction[0], max_dist * self.direction[1]
-                    )
+                    self.move(max_dist * self.direction_x, max_dist * self.direction_y)
         # If current direction is possible, keep moving that way
-        elif do_move and self.can_move(self.direction[0], self.direction[1], maze_grid):
+        elif do_move and self.can_move(self.direction_x, self.direction_y, maze_grid):
             # Move delta_dist, or max possible if that is too far
             for i in range(delta_dist, 0, -1):
                 max_dist = i
-                if self.can_move(
-                    i * self.direction[0], i * self.direction[1], maze_grid
-                ):
+                if self.can_move(i * self.direction_x, i * self.direction_y, maze_grid):
                     break
-            self.move(max_dist * self.direction[0], max_dist * self.direction[1])
+            self.move(max_dist * self.direction_x, max_dist * self.direction_y)
         else:
             # No movement possible, so update motion vector with 0, 0
-            self.set_motion_vector(0, 0)
+            self.motion_x = 0
+            self.motion_y = 0
             if do_move:
                 self.got_stopped = True
 
         # Return whether or not movement occured
-        if not do_move or orig_position == (
-            self.center_position[0],
-            self.center_position[1],
-        ):
+        if not do_move or (orig_x == self.center_x and orig_y == self.center_y):
             return False
         return True
 
@@ -235,45 +335,45 @@ class Sprite:
     def set_orientation(self):
         if self.rotate_image:
             # Horizontal
-            if self.motion_vector[0] != 0:
+            if self.motion_x != 0:
                 self.image = self.orig_image
             # Vertical
             else:
                 self.image = self.rotate_image
         else:
             # Moving right
-            if self.motion_vector[0] > 0:
+            if self.motion_x > 0:
                 self.rotation_angle = 0
                 self.mirror = False
                 self.facing = "right"
             # Moving left
-            elif self.motion_vector[0] < 0:
+            elif self.motion_x < 0:
                 self.rotation_angle = 0
                 self.mirror = True
                 self.facing = "left"
             # Moving up, where previously facing right, or wheels to the right
-            elif self.motion_vector[1] < 0 and (
+            elif self.motion_y < 0 and (
                 self.facing == "right" or self.facing == "wheels_right"
             ):
                 self.rotation_angle = 90  # rotate ccw
                 self.mirror = False
                 self.facing = "wheels_right"
             # Moving up, where previously facing left, or wheels to the left
-            elif self.motion_vector[1] < 0 and (
+            elif self.motion_y < 0 and (
                 self.facing == "left" or self.facing == "wheels_left"
             ):
                 self.rotation_angle = 90  # rotate ccw
                 self.mirror = True  # then mirror horizontally
                 self.facing = "wheels_left"
             # Moving down, where previously facing right, or wheels to the left
-            elif self.motion_vector[1] > 0 and (
+            elif self.motion_y > 0 and (
                 self.facing == "right" or self.facing == "wheels_left"
             ):
                 self.rotation_angle = -90  # rotate cw
                 self.mirror = False
                 self.facing = "wheels_left"
             # Moving down, where previously facing left, or wheels to the right
-            elif self.motion_vector[1] > 0 and (
+            elif self.motion_y > 0 and (
                 self.facing == "left" or self.facing == "wheels_right"
             ):
                 self.rotation_angle = -90  # rotate cw
@@ -282,7 +382,7 @@ class Sprite:
 
     # Method to draw onto screen at its position, with screen offsets as needed
     def draw(self, draw_image_x, draw_image_y, image_boundary, maze_factor):
-        self.get_image()
+        self.dirty = False
         draw_image = self.image
         if self.rotation_angle != 0:
             draw_image = pygame.transform.rotate(draw_image, self.rotation_angle)
@@ -290,47 +390,67 @@ class Sprite:
             draw_image = pygame.transform.flip(draw_image, True, False)
         image_rect = draw_image.get_rect()
         image_rect.center = (
-            int(self.center_position[0] * maze_factor),
-            int(self.center_position[1] * maze_factor),
+            int(self.center_x * maze_factor),
+            int(self.center_y * maze_factor),
         )
         image_rect.move_ip(draw_image_x + image_boundary, draw_image_y + image_boundary)
+        # Return data needed for screen blit
+        return draw_image, image_rect
+
+    # Method to advance animation to the current frame, to be called once per
+    # game tick before drawing
+    def update_animation(self):
+        self.get_image()
         # If animation finished, reset variables
         if (
             self.animation_start_time
-            and self.animation_index == len(self.animation_sequence) - 1
+            and self.animation_index == len(self.animation_delays) - 1
         ):
-            self.animation_sequence = []
+            self.animation_delays = ()
+            self.animation_images = ()
             self.animation_index = 0
             self.animation_start_time = None
-        # Return data needed for screen blit
-        return draw_image, image_rect
 
-    # Method to initialize animation
+    # Method to initialize animation, using a timeline of cumulative delays
+    # and images which is shared by sprites animating the same series
     def animate(self, all_images, image_names, time_delays):
-        images = []
-        for image_str in image_names:
-            images.append(all_images[image_str])
-
-        keys = ["image", "time_delay"]
-        for image, time_delay in zip(images, time_delays):
-            self.animation_sequence.append(dict(zip(keys, [image, time_delay])))
+        key = (tuple(image_names), tuple(time_delays))
+        timeline = Sprite.timelines.get(key)
+        # Recompile if the images were reloaded (e.g., recolored for a new level)
+        if timeline is None or timeline[0] is not all_images:
+            frames = list(zip(image_names, time_delays))
+            timeline = (
+                all_images,
+                tuple(time_delay for _, time_delay in frames),
+                tuple(all_images[image_str] for image_str, _ in frames),
+            )
+            Sprite.timelines[key] = timeline
+        self.animation_delays = timeline[1]
+        self.animation_images = timeline[2]
+        self.animation_index = 0
         self.animation_start_time = time.time()
 
     # Method to get correct animation frame at a given time
     def get_image(self):
-        if self.animation_sequence:
-            for index, frame in enumerate(self.animation_sequence):
-                if time.time() - self.animation_start_time >= frame.get("time_delay"):
-                    self.image = frame.get("image")
-                    self.animation_index = index
+        if self.animation_delays:
+            elapsed_time = time.time() - self.animation_start_time
+            index = bisect_right(self.animation_delays, elapsed_time) - 1
+            if index >= 0:
+                if self.image is not self.animation_images[index]:
+                    self.image = self.animation_images[index]
+                    self.dirty = True
+                self.animation_index = index
 
     # Set sprite desired direction to input values
     def set_desired_direction(self, x_direction, y_direction):
-        self.desired_direction = (x_direction, y_direction)
+        self.has_desired = True
+        self.desired_x = x_direction
+        self.desired_y = y_direction
 
     # Set sprite direction to input values
     def set_direction(self, x_direction, y_direction):
-        self.direction = (x_direction, y_direction)
+        self.direction_x = x_direction
+        self.direction_y = y_direction
 
     # Perform collision check with another sprite
     def collide_check(self, second_sprite: "Sprite"):
@@ -339,7 +459,9 @@ class Sprite:
     # Set sprite image to original, and reset animation
     def reset_image(self):
         self.image = self.orig_image
-        self.animation_sequence = []
+        self.dirty = True
+        self.animation_delays = ()
+        self.animation_images = ()
         self.animation_index = 0
         self.animation_start_time = None
 
@@ -354,6 +476,7 @@ class Sprite:
     # Set flag to prevent respawn
     def toggle_spawn(self):
         self.spawn = not self.spawn
+        self.dirty = True
 
     # Return flag of whether sprite respawn active
     def can_spawn(self):
@@ -369,7 +492,8 @@ class Sprite:
 
     # Set motion vector
     def set_motion_vector(self, x_direction, y_direction):
-        self.motion_vector = (x_direction, y_direction)
+        self.motion_x = x_direction
+        self.motion_y = y_direction
 
     # Return direction
     def get_direction(self):
@@ -386,14 +510,14 @@ class Sprite:
 
     # Return proximity to second sprite
     def get_proximity(self, second_sprite: "Sprite"):
-        dx = self.get_center_position()[0] - second_sprite.get_center_position()[0]
-        dy = self.get_center_position()[1] - second_sprite.get_center_position()[1]
+        dx = self.center_x - second_sprite.center_x
+        dy = self.center_y - second_sprite.center_y
         return abs(dx) + abs(dy)
 
     # Return proximity to second sprite in components
     def get_proximity_dx_dy(self, second_sprite: "Sprite"):
-        dx = self.get_center_position()[0] - second_sprite.get_center_position()[0]
-        dy = self.get_center_position()[1] - second_sprite.get_center_position()[1]
+        dx = self.center_x - second_sprite.center_x
+        dy = self.center_y - second_sprite.center_y
         return dx, dy
 
     # Return path width
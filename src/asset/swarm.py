@@ -0,0 +1,363 @@
+import numpy as np
+from settings import config as cfg
+
+
+# Class to advance all enemies of a level together. Positions, directions,
+# speeds and move accumulators are stored in arrays, and each game tick is
+# performed as a handful of vectorized steps against tables built from the
+# maze grid. The Enemy objects become thin views: their position, Rects and
+# sightline flags are written back only when changed, so that rendering and
+# collision checks can keep using them.
+class EnemySwarm:
+    # Clearance reported for a direction of (0, 0), which is always possible
+    NO_LIMIT = np.iinfo(np.int64).max
+
+    def __init__(
+        self,
+        enemies,
+        maze_grid,
+        sightline_index,
+        maze_factor,
+        maze_graph_coords,
+    ):
+        self.enemies = enemies
+        self.maze_grid = maze_grid
+        self.sightline_index = sightline_index
+        self.maze_factor = maze_factor
+        self.rng = np.random.default_rng()
+
+        num_enemies = len(enemies)
+        for slot, enemy in enumerate(enemies):
+            enemy.swarm_slot = slot
+
+        # Movement state, one entry per enemy
+        self.pos_x = np.zeros(num_enemies, dtype=np.int64)
+        self.pos_y = np.zeros(num_enemies, dtype=np.int64)
+        self.dir_x = np.zeros(num_enemies, dtype=np.int64)
+        self.dir_y = np.zeros(num_enemies, dtype=np.int64)
+        self.desired_x = np.zeros(num_enemies, dtype=np.int64)
+        self.desired_y = np.zeros(num_enemies, dtype=np.int64)
+        self.desired_set = np.zeros(num_enemies, dtype=bool)
+        self.speed = np.array([e.speed for e in enemies], dtype=np.float64)
+        self.move_dist = np.array([e.move_dist for e in enemies], dtype=np.float64)
+        self.seen_player = np.zeros(num_enemies, dtype=bool)
+        self.path_finding = np.zeros(num_enemies, dtype=bool)
+
+        # Fixed sizes, one entry per enemy
+        self.path_width = np.array([e.path_width for e in enemies], dtype=np.int64)
+        self.hitbox_width = np.array([e.hitbox_width for e in enemies], dtype=np.int64)
+
+        # Clearance tables for each path width in use
+        walls = np.asarray(maze_grid, dtype=bool)
+        self.clearance = {
+            int(width): EnemySwarm.build_clearance(walls, int(width))
+            for width in np.unique(self.path_width)
+        }
+
+        # Table of maze graph coordinates, used to look up flow field vectors
+        graph_height = cfg.MAZE_HEIGHT + 1
+        graph_width = cfg.MAZE_WIDTH + 1
+        self.in_graph = np.zeros((graph_height, graph_width), dtype=bool)
+        if maze_graph_coords:
+            graph_coords = np.array(maze_graph_coords, dtype=np.int64)
+            self.in_graph[graph_coords[:, 1], graph_coords[:, 0]] = True
+        self.flow_x = np.zeros((graph_height, graph_width), dtype=np.int64)
+        self.flow_y = np.zeros((graph_height, graph_width), dtype=np.int64)
+        self.flow_field_source = None
+
+        self.load_views()
+
+    # Method to build tables of how many cells a path rect of a given width
+    # can advance in each direction, indexed by its top (horizontal moves)
+    # or left (vertical moves) and by the first cell it would enter.
+    # Tables are padded by one so that out of bounds lookups give zero.
+    @staticmethod
+    def build_clearance(walls, width):
+        grid_height, grid_width = walls.shape
+        clearance = {}
+
+        # Horizontal bands: a column is free if all rows of the band are path
+        wall_count = np.vstack(
+            (np.zeros((1, grid_width), dtype=np.int64), np.cumsum(walls, axis=0))
+        )
+        band_free = (wall_count[width:] - wall_count[:-width]) == 0
+        before, after = EnemySwarm.run_lengths(band_free)
+        clearance["right"] = np.zeros((grid_height + 1, grid_width + 1), np.int64)
+        clearance["left"] = np.zeros((grid_height + 1, grid_width + 1), np.int64)
+        clearance["right"][: band_free.shape[0], :grid_width] = after
+        clearance["left"][: band_free.shape[0], :grid_width] = before
+
+        # Vertical bands: a row is free if all columns of the band are path
+        wall_count = np.hstack(
+            (np.zeros((grid_height, 1), dtype=np.int64), np.cumsum(walls, axis=1))
+        )
+        band_free = ((wall_count[:, width:] - wall_count[:, :-width]) == 0).T
+        before, after = EnemySwarm.run_lengths(band_free)
+        clearance["down"] = np.zeros((grid_width + 1, grid_height + 1), np.int64)
+        clearance["up"] = np.zeros((grid_width + 1, grid_height + 1), np.int64)
+        clearance["down"][: band_free.shape[0], :grid_height] = after
+        clearance["up"][: band_free.shape[0], :grid_height] = before
+
+        return clearance
+
+    # Helper method for build_clearance to count, for each free cell, how many
+    # free cells of its row segment lie at or before it, and at or after it
+    @staticmethod
+    def run_lengths(free_cells):
+        num_cols = free_cells.shape[1]
+        index = np.arange(num_cols)
+        last_blocked = np.maximum.accumulate(np.where(free_cells, -1, index), axis=1)
+        next_blocked = np.minimum.accumulate(
+            np.where(free_cells, num_cols, index)[:, ::-1], axis=1
+        )[:, ::-1]
+        before = np.where(free_cells, index - last_blocked, 0)
+        after = np.where(free_cells, next_blocked - index, 0)
+        return before, after
+
+    # Method to copy movement state from the Enemy objects, such as after
+    # they have been reset to the enemy start location. Move accumulators
+    # are kept, as a reset does not change them.
+    def load_views(self):
+        for slot, enemy in enumerate(self.enemies):
+            self.pos_x[slot] = enemy.center_x
+            self.pos_y[slot] = enemy.center_y
+            self.dir_x[slot] = enemy.direction_x
+            self.dir_y[slot] = enemy.direction_y
+            if enemy.has_desired:
+                self.desired_x[slot] = enemy.desired_x
+                self.desired_y[slot] = enemy.desired_y
+                self.desired_set[slot] = True
+            else:
+                self.desired_x[slot], self.desired_y[slot] = 0, 0
+                self.desired_set[slot] = False
+            self.seen_player[slot] = enemy.seen_player
+            self.path_finding[slot] = enemy.path_finding
+
+    # Method to convert a flow field dictionary into direction tables
+    def load_flow_field(self, flow_field):
+        self.flow_x.fill(0)
+        self.flow_y.fill(0)
+        for (x, y), direction in flow_field.items():
+            if direction:
+                self.flow_x[y, x], self.flow_y[y, x] = direction
+        self.flow_field_source = flow_field
+
+    # Method to get how far each enemy in slots can move in a direction,
+    # where a direction of (0, 0) is always possible
+    def get_clearance(self, slots, dir_x, dir_y):
+        result = np.full(len(slots), EnemySwarm.NO_LIMIT, dtype=np.int64)
+        for width, clearance in self.clearance.items():
+            if len(self.clearance) > 1:
+                group = self.path_width[slots] == width
+            else:
+                group = slice(None)
+            left = self.pos_x[slots[group]] - width // 2
+            top = self.pos_y[slots[group]] - width // 2
+            group_x = dir_x[group]
+            group_y = dir_y[group]
+            # Sprites lie within the maze, so lookups stay within the tables
+            result[group] = np.where(
+                group_x > 0,
+                clearance["right"][top, left + width],
+                np.where(
+                    group_x < 0,
+                    clearance["left"][top, left - 1],
+                    np.where(
+                        group_y > 0,
+                        clearance["down"][left, top + width],
+                        np.where(
+                            group_y < 0,
+                            clearance["up"][left, top - 1],
+                            EnemySwarm.NO_LIMIT,
+                        ),
+                    ),
+                ),
+            )
+        return result
+
+    # Method to turn around enemies colliding with a barrier sprite
+    def collide_barriers(self, slots, due, barrier_sprites):
+        half_width = self.hitbox_width[slots] // 2
+        left = self.pos_x[slots] - half_width
+        top = self.pos_y[slots] - half_width
+        right = left + self.hitbox_width[slots]
+        bottom = top + self.hitbox_width[slots]
+        turn_around = np.zeros(len(slots), dtype=bool)
+        for sprite in barrier_sprites:
+            barrier_rect = barrier_sprites[sprite].hitbox_rect
+            if barrier_rect.width == 0 or barrier_rect.height == 0:
+                continue
+            turn_around |= (
+                (left < barrier_rect.right)
+                & (top < barrier_rect.bottom)
+                & (right > barrier_rect.left)
+                & (bottom > barrier_rect.top)
+            )
+        turn_around &= due & (self.hitbox_width[slots] > 0)
+        turn_slots = slots[turn_around]
+        self.desired_x[turn_slots] = -self.dir_x[turn_slots]
+        self.desired_y[turn_slots] = -self.dir_y[turn_slots]
+        self.desired_set[turn_slots] = True
+        self.seen_player[turn_slots] = False
+        self.path_finding[turn_slots] = False
+
+    # Method to set desired direction from flow field for enemies that have
+    # seen the player, returning which enemies still need to navigate
+    def set_pathfind_directions(self, slots, flow_field):
+        needs_navigate = np.ones(len(slots), dtype=bool)
+        if not flow_field:
+            return needs_navigate
+        if flow_field is not self.flow_field_source:
+            self.load_flow_field(flow_field)
+
+        graph_x = self.pos_x[slots] * self.maze_factor // cfg.SCALE_FACTOR
+        graph_y = self.pos_y[slots] * self.maze_factor // cfg.SCALE_FACTOR
+        graph_x = np.clip(graph_x, 0, self.in_graph.shape[1] - 1)
+        graph_y = np.clip(graph_y, 0, self.in_graph.shape[0] - 1)
+        seen = self.seen_player[slots]
+        on_graph = seen & self.in_graph[graph_y, graph_x]
+
+        # Follow the flow field, or move down if no direction is available
+        flow_slots = slots[on_graph]
+        flow_x = self.flow_x[graph_y[on_graph], graph_x[on_graph]]
+        flow_y = self.flow_y[graph_y[on_graph], graph_x[on_graph]]
+        has_flow = (flow_x != 0) | (flow_y != 0)
+        self.desired_x[flow_slots] = np.where(has_flow, flow_x, 0)
+        self.desired_y[flow_slots] = np.where(has_flow, flow_y, 1)
+        self.desired_set[flow_slots] = True
+        self.path_finding[flow_slots] = has_flow
+
+        # Enemies off the graph keep their course while pathfinding
+        needs_navigate = ~on_graph & ~(seen & self.path_finding[slots])
+        return needs_navigate
+
+    # Method to check sightlines for enemies aligned with the player
+    def check_sightlines(self, slots, player, barrier_sprites):
+        player_x = player.center_x
+        player_y = player.center_y
+        unseen = ~self.seen_player[slots]
+        aligned = (self.pos_x[slots] == player_x) | (self.pos_y[slots] == player_y)
+        for slot in slots[unseen & aligned]:
+            move_dir = self.enemies[slot].can_see_player(
+                player, barrier_sprites, self.maze_grid, self.sightline_index
+            )
+            if move_dir:
+                self.desired_x[slot], self.desired_y[slot] = move_dir
+                self.desired_set[slot] = True
+                self.seen_player[slot] = True
+
+    # Method for random navigation, moving towards the player if seen,
+    # otherwise choosing a random direction and only backtracking if needed
+    def navigate(self, slots, player, barrier_sprites):
+        if player:
+            self.check_sightlines(slots, player, barrier_sprites)
+
+        # Choose a random direction if currently stopped
+        stopped = ~self.desired_set[slots] | (
+            (self.desired_x[slots] == 0) & (self.desired_y[slots] == 0)
+        )
+        if stopped.any():
+            dirs = np.array([(1, 0), (-1, 0), (0, -1), (0, 1)], dtype=np.int64)
+            rand_dirs = dirs[self.rng.integers(0, 4, int(stopped.sum()))]
+            stopped_slots = slots[stopped]
+            self.desired_x[stopped_slots] = rand_dirs[:, 0]
+            self.desired_y[stopped_slots] = rand_dirs[:, 1]
+            self.desired_set[stopped_slots] = True
+
+        # Check current direction, then orthogonal directions, then reverse
+        desired_x = self.desired_x[slots]
+        desired_y = self.desired_y[slots]
+        candidates_x = np.stack((desired_x, desired_y, -desired_y, -desired_x), 1)
+        candidates_y = np.stack((desired_y, desired_x, -desired_x, -desired_y), 1)
+        valid = np.stack(
+            [
+                self.get_clearance(slots, candidates_x[:, i], candidates_y[:, i]) >= 1
+                for i in range(4)
+            ],
+            1,
+        )
+
+        # If no directions are possible or only reverse possible, these take
+        # precedent. Keep going towards the player if seen and possible.
+        # Otherwise, pick a random direction of the remaining possibilities.
+        no_valid = ~valid.any(axis=1)
+        only_reverse = valid[:, 3] & ~valid[:, :3].any(axis=1)
+        keep_course = self.seen_player[slots] & valid[:, 0]
+        choose = ~no_valid & ~only_reverse & ~keep_course
+        weights = (1 + self.rng.random((len(slots), 3))) * valid[:, :3]
+        chosen = np.argmax(weights, axis=1)
+        chosen = np.where(only_reverse, 3, chosen)
+        change = choose | only_reverse
+        rows = np.arange(len(slots))
+        new_x = np.where(no_valid, 0, candidates_x[rows, chosen])
+        new_y = np.where(no_valid, 0, candidates_y[rows, chosen])
+        change_slots = slots[change | no_valid]
+        self.desired_x[change_slots] = new_x[change | no_valid]
+        self.desired_y[change_slots] = new_y[change | no_valid]
+
+    # Method to perform moves based on direction, clearance, time, and speed
+    def perform_moves(self, slots, game_tick):
+        self.move_dist[slots] += self.speed[slots] * game_tick
+        delta_dist = np.floor(self.move_dist[slots]).astype(np.int64)
+        do_move = delta_dist >= 1
+        self.move_dist[slots] -= np.where(do_move, delta_dist, 0)
+
+        # If nonzero direction was commanded and is possible, turn that way
+        desired_x = self.desired_x[slots]
+        desired_y = self.desired_y[slots]
+        desired_ok = self.desired_set[slots] & (
+            self.get_clearance(slots, desired_x, desired_y) >= 1
+        )
+        turn = desired_ok & ((desired_x != 0) | (desired_y != 0))
+        turn_slots = slots[turn]
+        self.dir_x[turn_slots] = desired_x[turn]
+        self.dir_y[turn_slots] = desired_y[turn]
+
+        # Move delta_dist along direction, or max possible if that is too far
+        dir_x = self.dir_x[slots]
+        dir_y = self.dir_y[slots]
+        clearance = self.get_clearance(slots, dir_x, dir_y)
+        moving = do_move & (turn | (~desired_ok & (clearance >= 1)))
+        move_dist = np.where(moving, np.minimum(delta_dist, clearance), 0)
+        delta_x = move_dist * dir_x
+        delta_y = move_dist * dir_y
+        self.pos_x[slots] += delta_x
+        self.pos_y[slots] += delta_y
+
+        # Update Enemy views which have moved
+        moved = (delta_x != 0) | (delta_y != 0)
+        for slot, step_x, step_y in zip(
+            slots[moved].tolist(), delta_x[moved].tolist(), delta_y[moved].tolist()
+        ):
+            self.enemies[slot].move(step_x, step_y)
+        return bool(moved.any())
+
+    # Method to advance enemies by one game tick, returning whether any moved
+    def step(self, enemies, player, flow_field, barrier_sprites, game_tick):
+        if not enemies:
+            return False
+        slots = np.fromiter((enemy.swarm_slot for enemy in enemies), np.int64)
+        old_seen = self.seen_player[slots].copy()
+        old_path_finding = self.path_finding[slots].copy()
+
+        # Enemies which will reach the threshold of 1 pixel this tick
+        due = self.move_dist[slots] + self.speed[slots] * game_tick >= 1
+
+        self.collide_barriers(slots, due, barrier_sprites)
+        if player:
+            needs_navigate = self.set_pathfind_directions(slots, flow_field)
+        else:
+            needs_navigate = np.ones(len(slots), dtype=bool)
+        navigate_slots = slots[needs_navigate & due]
+        if len(navigate_slots):
+            self.navigate(navigate_slots, player, barrier_sprites)
+        enemy_move = self.perform_moves(slots, game_tick)
+
+        # Write back changed flags, which are read when actors are reset
+        changed = (self.seen_player[slots] != old_seen) | (
+            self.path_finding[slots] != old_path_finding
+        )
+        for slot in slots[changed].tolist():
+            self.enemies[slot].seen_player = bool(self.seen_player[slot])
+            self.enemies[slot].path_finding = bool(self.path_finding[slot])
+        return enemy_move
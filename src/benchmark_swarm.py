@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+import numpy as np
+import pygame
+from settings import config as cfg
+from fileio.load import get_levels
+from game.start import Flags
+from game.level import load_level_files, create_grid, get_level_data
+from game.assets import init_items, init_enemies
+from game.play import move_sprites
+from path.pathfind import create_graph
+from path.sightline import SightlineIndex
+from asset import enemy as enemy_module
+from asset.player import Player
+from asset.swarm import EnemySwarm
+
+# Directions the player is steered in turn, and the game ticks between turns
+PLAYER_DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+PLAYER_TURN_TICKS = 150
+
+# Game ticks between enemies leaving the enemy start, so that they spread out
+ENEMY_SPAWN_TICKS = 20
+
+# Step between the numbers of enemies timed
+TIMING_STEP = 6
+
+
+# Class to stand in for the random choices made by enemies, always taking
+# the first option, so that both backends make the same choices
+class FirstChoice:
+    # Method standing in for random.randint
+    def randint(self, low, high):
+        return low
+
+    # Method standing in for random.choice
+    def choice(self, options):
+        return options[0]
+
+    # Method standing in for Generator.integers
+    def integers(self, low, high, size):
+        return np.full(size, low, dtype=np.int64)
+
+    # Method standing in for Generator.random, decreasing so the first
+    # valid option has the largest weight
+    def random(self, shape):
+        return np.broadcast_to(np.linspace(0.9, 0.1, shape[1]), shape)
+
+
+# Function to set up the maze, player, items and a number of enemies of a
+# level, with enemies cycling through the kinds the level builder offers
+def init_level(level, maze_factor, num_enemies):
+    maze_assets, maze_metadata, maze_path = load_level_files([level], 0)
+    maze_grid = create_grid(
+        cfg.MAZE_WIDTH * cfg.SCALE_FACTOR,
+        cfg.MAZE_HEIGHT * cfg.SCALE_FACTOR,
+        cfg.BLOCK_WIDTH * cfg.SCALE_FACTOR,
+        maze_factor,
+        maze_path,
+    )
+    maze_graph, maze_graph_coords = create_graph(
+        maze_path, cfg.SCALE_FACTOR, cfg.BLOCK_WIDTH
+    )
+    _, _, _, pixels_per_second, _, asset_coord = get_level_data(
+        Flags(), maze_factor, maze_metadata, maze_assets
+    )
+    block_width = cfg.BLOCK_WIDTH * cfg.SCALE_FACTOR
+    image = pygame.Surface((block_width, block_width))
+    images = {name: image for name in cfg.ITEM_IMAGE_DEFS.values()}
+
+    items = init_items(asset_coord, images, block_width, maze_factor)
+    sightline_index = SightlineIndex(maze_grid)
+    for key, value in items.items():
+        sightline_index.add_barrier(key, value)
+    player = Player(
+        "player",
+        image,
+        asset_coord.get("S"),
+        pixels_per_second,
+        True,
+        int(block_width / (maze_factor * 2)),
+        int(block_width / maze_factor),
+        None,
+    )
+    enemies = []
+    for index in range(num_enemies):
+        enemies += init_enemies(
+            ["corn", "tomato", "pumpkin"][index % 3],
+            1,
+            image,
+            asset_coord.get("E"),
+            pixels_per_second,
+            int(0.9 * block_width / maze_factor),
+            int(block_width / maze_factor),
+            None,
+            index % 3 == 2,
+        )
+
+    return (
+        maze_grid,
+        maze_graph,
+        maze_graph_coords,
+        items,
+        sightline_index,
+        player,
+        enemies,
+    )
+
+
+# Function to advance the enemies of a level for a number of game ticks,
+# with or without a swarm, returning the seconds taken and the enemy states
+# after each tick
+def run_enemies(level, maze_factor, num_enemies, num_ticks, use_swarm, first_choice):
+    (
+        maze_grid,
+        maze_graph,
+        maze_graph_coords,
+        items,
+        sightline_index,
+        player,
+        enemies,
+    ) = init_level(level, maze_factor, num_enemies)
+    enemy_swarm = None
+    if use_swarm:
+        enemy_swarm = EnemySwarm(
+            enemies, maze_grid, sightline_index, maze_factor, maze_graph_coords
+        )
+        if first_choice:
+            enemy_swarm.rng = FirstChoice()
+
+    game_tick = cfg.GAME_TICK * maze_factor
+    flags = Flags()
+    flow_field = None
+    states = []
+    total_seconds = 0
+    for tick in range(num_ticks):
+        # Steer the player around the maze, so enemies see and chase it
+        if tick % PLAYER_TURN_TICKS == 0:
+            player.set_desired_direction(
+                *PLAYER_DIRECTIONS[tick // PLAYER_TURN_TICKS % len(PLAYER_DIRECTIONS)]
+            )
+        start_time = time.perf_counter()
+        flags, flow_field = move_sprites(
+            player,
+            None,
+            enemies[: tick // ENEMY_SPAWN_TICKS + 1],
+            flags,
+            maze_grid,
+            game_tick,
+            maze_graph,
+            maze_graph_coords,
+            maze_factor,
+            flow_field,
+            dict(items),
+            sightline_index,
+            enemy_swarm,
+            None,
+        )
+        total_seconds += time.perf_counter() - start_time
+        if first_choice:
+            states.append(
+                [
+                    (enemy.center_x, enemy.center_y, enemy.seen_player)
+                    for enemy in enemies
+                ]
+            )
+    return total_seconds, states
+
+
+# Check the enemy swarm against per-enemy updates on each level, then time
+# both for increasing numbers of enemies, up to the most a level can have.
+# The first argument is the maze factor to use (2 by default), and the
+# second the number of game ticks to run on each level.
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    maze_factor = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    num_ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    levels = get_levels(cfg.DIRS["levels"])
+    max_enemies = cfg.MAX_CORN + cfg.MAX_TOMATO + cfg.MAX_PUMPKIN
+
+    # Both backends should move enemies the same way given the same choices
+    enemy_random = enemy_module.random
+    enemy_module.random = FirstChoice()
+    num_mismatched = 0
+    for level in levels:
+        _, loop_states = run_enemies(
+            level, maze_factor, max_enemies, num_ticks, False, True
+        )
+        _, swarm_states = run_enemies(
+            level, maze_factor, max_enemies, num_ticks, True, True
+        )
+        if loop_states != swarm_states:
+            num_mismatched += 1
+            tick = next(
+                index
+                for index, (loop_state, swarm_state) in enumerate(
+                    zip(loop_states, swarm_states)
+                )
+                if loop_state != swarm_state
+            )
+            print(f"MISMATCH {level.get('folder')} at tick {tick}")
+    enemy_module.random = enemy_random
+    print(f"{len(levels) - num_mismatched} of {len(levels)} levels match")
+
+    # Time each backend over all levels, in ms per game tick
+    print("enemies  per-enemy ms  swarm ms")
+    for num_enemies in range(TIMING_STEP, max_enemies + 1, TIMING_STEP):
+        loop_seconds = 0
+        swarm_seconds = 0
+        for level in levels:
+            loop_seconds += run_enemies(
+                level, maze_factor, num_enemies, num_ticks, False, False
+            )[0]
+            swarm_seconds += run_enemies(
+                level, maze_factor, num_enemies, num_ticks, True, False
+            )[0]
+        num_level_ticks = num_ticks * len(levels)
+        print(
+            f"{num_enemies:7}  {loop_seconds * 1000 / num_level_ticks:12.3f}  "
+            f"{swarm_seconds * 1000 / num_level_ticks:8.3f}"
+        )
+
+    sys.exit(1 if num_mismatched else 0)
@@ -0,0 +1,11 @@
+from settings import config as cfg
+from fileio.export import export_sprite_atlas
+
+# Pack the sprite images into one atlas image and index, which the game and
+# level builder load in place of the individual images
+export_sprite_atlas(
+    cfg.DIRS["images"],
+    cfg.DIRS["atlas"] + cfg.FILES["atlas_image"],
+    cfg.DIRS["atlas"] + cfg.FILES["atlas_index"],
+    cfg.ATLAS_COLUMNS,
+)
@@ -3,30 +3,26 @@ from tkinter import messagebox, filedialog
 from settings import config as cfg
 from rect.utils import define_rect
 from rect.draw import draw_square, draw_asset, draw_maze
-from grid.utils import invert_maze_to_grid, grid_space
+from grid.utils import grid_space
+from builder.utils import scale_coords
+from builder.coords import OrderedCoords
 from fileio.load import read_csv_path
-from fileio.export import (
-    export_path_coords_to_csv,
-    export_asset_coords_to_csv,
-    export_metadata,
-    move_files,
-)
+from builder.autosave import load_autosave
 
 
-# Function to export screenshot
-def export_screenshot(maze_width, maze_height, image_boundary, screen, filename):
+# Function to capture a screenshot of the maze as a copy of the screen area
+def capture_screenshot(maze_width, maze_height, image_boundary, screen):
     screenshot_rect = pygame.Rect(
         cfg.DRAW_IMAGE_X,
         cfg.DRAW_IMAGE_Y,
         maze_width + 2 * image_boundary,
         maze_height + 2 * image_boundary,
     )
-    sub_surface = screen.subsurface(screenshot_rect)
-    pygame.image.save(sub_surface, filename)
-    print(f"Screenshot saved as {filename}")
+    return screen.subsurface(screenshot_rect).copy()
 
 
-# Function to export maze files
+# Function to export maze files, capturing the level data then leaving the
+# files to be written in the background
 def export_maze_files(
     screen,
     asset_coords,
@@ -40,40 +36,17 @@ def export_maze_files(
     enemy_quantity,
     enemy_index,
     asset_defs,
+    level_exporter,
 ):
     # Warning to user that final export will need all assets
     if len(asset_coords) < 8:
         messagebox.showinfo("Warning", cfg.MSG_STRING["all_assets"])
+    elif level_exporter.is_busy():
+        level_exporter.progress.put(("busy", 0, 0))
     else:
-        # Export screenshot with assets
-        export_screenshot(
-            maze_width,
-            maze_height,
-            image_boundary,
-            screen,
-            cfg.FILES["screenshot_assets"],
-        )
+        # Screenshot with assets
+        screenshot = capture_screenshot(maze_width, maze_height, image_boundary, screen)
 
-        # Export path coordinates to csv
-        export_path_coords_to_csv(
-            chosen_coords,
-            cfg.DRAW_IMAGE_X,
-            cfg.DRAW_IMAGE_Y,
-            image_boundary,
-        )
-        print("Level coordinates saved as " + cfg.FILES["path_coordinates"])
-
-        # Export asset coordinates to csv if applicable
-        if asset_coords:
-            export_asset_coords_to_csv(
-                asset_defs,
-                cfg.DRAW_IMAGE_X,
-                cfg.DRAW_IMAGE_Y,
-                image_boundary,
-            )
-            print("Asset coordinates saved as " + cfg.FILES["asset_coordinates"])
-
-        # Export maze metadata to csv
         # Maze metadata
         maze_metadata = {
             "maze_color": maze_colors[maze_color_index],
@@ -82,15 +55,49 @@ def export_maze_files(
             "tomato_quantity": enemy_quantity["tomato"][enemy_index["tomato"]],
             "pumpkin_quantity": enemy_quantity["pumpkin"][enemy_index["pumpkin"]],
         }
-        export_metadata(maze_metadata)
-        print("Maze metadata saved as " + cfg.FILES["metadata"])
 
-        # Move maze files to a selected directory
+        # Select the directory to write maze files to
         messagebox.showinfo("Instructions", cfg.MSG_STRING["maze_folder"])
         selected_directory = filedialog.askdirectory(
             initialdir="../assets/levels/", title="Select a Directory"
         )
-        move_files(".", selected_directory)
+        if selected_directory:
+            level_exporter.export_level(
+                selected_directory,
+                screenshot,
+                chosen_coords,
+                asset_defs,
+                maze_metadata,
+                image_boundary,
+            )
+
+
+# Function to show the progress of a level export, if changed
+def show_export_progress(level_exporter, screen, dirty_rects, fonts):
+    progress = level_exporter.get_progress()
+    if progress:
+        state, num_written, num_files = progress
+        match state:
+            case "progress":
+                text_line = cfg.EXPORT_TEXT["progress"].format(
+                    num_written + 1, num_files
+                )
+                selected_color = cfg.COLORS["black"]
+            case "done":
+                text_line = cfg.EXPORT_TEXT["done"]
+                selected_color = cfg.COLORS["dkgreen"]
+            case "failed":
+                text_line = cfg.EXPORT_TEXT["failed"]
+                selected_color = cfg.COLORS["red"]
+            case "busy":
+                text_line = cfg.EXPORT_TEXT["busy"]
+                selected_color = cfg.COLORS["orange"]
+
+        progress_rect = pygame.Rect(cfg.WHITE_RECTS["export_progress"])
+        screen.fill(cfg.COLORS["white"], progress_rect)
+        text_surface = fonts["normal"].render(text_line, True, selected_color)
+        screen.blit(text_surface, cfg.TEXT_LOC["export_progress"])
+        dirty_rects.append(progress_rect)
 
 
 # Function to change color of maze
@@ -102,6 +109,21 @@ def change_maze_color(
         maze_color_index = 0
     else:
         maze_color_index += 1
+    recolor_maze(
+        screen,
+        maze_colors[maze_color_index_old],
+        maze_colors[maze_color_index],
+        image_boundary,
+        maze_width,
+        maze_height,
+    )
+    pygame.display.update()
+
+    return maze_color_index
+
+
+# Function to replace the wall color of the maze, returning the area changed
+def recolor_maze(screen, old_color, new_color, image_boundary, maze_width, maze_height):
     maze_rect = pygame.Rect(
         cfg.DRAW_IMAGE_X + image_boundary,
         cfg.DRAW_IMAGE_X + image_boundary,
@@ -110,13 +132,10 @@ def change_maze_color(
     )
     sub_surface = screen.subsurface(maze_rect)
     pixel_array = pygame.PixelArray(sub_surface)
-    pixel_array.replace(
-        maze_colors[maze_color_index_old], maze_colors[maze_color_index]
-    )
+    pixel_array.replace(old_color, new_color)
     del pixel_array
-    pygame.display.update()
 
-    return maze_color_index
+    return maze_rect
 
 
 # Function to cycle level speed
@@ -180,7 +199,7 @@ def cycle_enemy_quantity(
 
 # Function to initialize asset placement:
 def init_asset_placement(
-    chosen_coords,
+    occupancy_grid,
     image_boundary,
     maze_width,
     maze_height,
@@ -189,41 +208,18 @@ def init_asset_placement(
     fonts,
     asset_letters,
     asset_defs,
+    level_exporter,
 ):
-    # Coarsen inputs prior to creating maze grid to optimize runtime
-    coords_scaled = []
-    for coord in chosen_coords:
-        coords_scaled.append(
-            (
-                int((coord[0] - cfg.DRAW_IMAGE_X - image_boundary) / cfg.SCALE_FACTOR),
-                int((coord[1] - cfg.DRAW_IMAGE_Y - image_boundary) / cfg.SCALE_FACTOR),
-            )
-        )
-
-    # Create maze grid
-    my_maze = invert_maze_to_grid(
-        coords_scaled,
-        cfg.MAZE_WIDTH,
-        cfg.MAZE_HEIGHT,
-        0,
-        0,
-        0,
-        cfg.BLOCK_WIDTH,
-    )
     # Determine how many full squares reside in maze
-    num_maze_squares = grid_space(my_maze) / (cfg.BLOCK_WIDTH**2)
+    num_maze_squares = grid_space(occupancy_grid.maze_grid) / (cfg.BLOCK_WIDTH**2)
 
     # Create warning message if path space deemed too sparse
     if num_maze_squares < 8:
         messagebox.showinfo("Warning", cfg.MSG_STRING["asset_space"])
     else:
-        # Export screenshot without assets
-        export_screenshot(
-            maze_width,
-            maze_height,
-            image_boundary,
-            screen,
-            cfg.FILES["screenshot_no_assets"],
+        # Screenshot without assets, exported with the other maze files
+        level_exporter.no_assets_screenshot = capture_screenshot(
+            maze_width, maze_height, image_boundary, screen
         )
 
         # Flag for discontinuing maze drawing
@@ -268,6 +264,7 @@ def assign_asset_loc(
     event,
     asset_coords,
     chosen_coords,
+    occupancy_grid,
     dirty_rects,
     screen,
     maze_width,
@@ -277,6 +274,7 @@ def assign_asset_loc(
     block_width,
     fonts,
     asset_defs,
+    edit_log,
 ):
     # If asset key is pressed once this mode chosen, draw asset
     matching_asset = [
@@ -290,6 +288,7 @@ def assign_asset_loc(
         asset_coord_result = draw_asset(
             asset_coords,
             chosen_coords,
+            occupancy_grid,
             dirty_rects,
             screen,
             cfg.DRAW_IMAGE_X,
@@ -310,12 +309,17 @@ def assign_asset_loc(
             for asset in asset_defs:
                 if asset.get("letter") == matching_asset[0].get("letter"):
                     asset["location"] = asset_coord_result
+            edit_log.record(
+                ("asset", matching_asset[0].get("letter"), asset_coord_result)
+            )
 
     return asset_defs
 
 
 # Function to load maze from file
-def import_maze_from_file(image_boundary, maze_width, maze_height, block_width, screen):
+def import_maze_from_file(
+    image_boundary, maze_width, maze_height, block_width, screen, occupancy_grid
+):
     file_path = filedialog.askopenfilename(
         title="Select a level path coordinates CSV file",
         filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
@@ -324,8 +328,77 @@ def import_maze_from_file(image_boundary, maze_width, maze_height, block_width,
 
     maze_coords = read_csv_path(file_path)
 
+    chosen_coords, shifted_coords_history = load_maze(
+        maze_coords,
+        cfg.COLORS["teal"],
+        image_boundary,
+        maze_width,
+        maze_height,
+        block_width,
+        screen,
+        occupancy_grid,
+    )
+
+    maze_color_index = 0
+
+    return chosen_coords, shifted_coords_history, maze_color_index
+
+
+# Function to recover a maze autosaved by a previous session, if wanted
+def recover_autosaved_maze(
+    image_boundary,
+    maze_width,
+    maze_height,
+    block_width,
+    maze_colors,
+    maze_color_index,
+    screen,
+    chosen_coords,
+    shifted_coords_history,
+    occupancy_grid,
+):
+    autosaved_maze = load_autosave(cfg.DIRS["autosave"])
+    if autosaved_maze and messagebox.askyesno(
+        "Recover", cfg.MSG_STRING["recover_autosave"]
+    ):
+        screen_coords, maze_color_index = autosaved_maze
+
+        # Remove screen offsets
+        maze_coords = [
+            (
+                x - cfg.DRAW_IMAGE_X - image_boundary,
+                y - cfg.DRAW_IMAGE_Y - image_boundary,
+            )
+            for x, y in screen_coords
+        ]
+        chosen_coords, shifted_coords_history = load_maze(
+            maze_coords,
+            maze_colors[maze_color_index],
+            image_boundary,
+            maze_width,
+            maze_height,
+            block_width,
+            screen,
+            occupancy_grid,
+        )
+
+    return chosen_coords, shifted_coords_history, maze_color_index
+
+
+# Function to draw a maze from path coordinates and set it as the maze being
+# built, returning its coordinates and shifted coordinate history
+def load_maze(
+    maze_coords,
+    maze_color,
+    image_boundary,
+    maze_width,
+    maze_height,
+    block_width,
+    screen,
+    occupancy_grid,
+):
     # Draw maze onto screen, with a gray boundary
-    # and inside drawable teal area
+    # and inside drawable area of the wall color
     draw_maze(
         cfg.DRAW_IMAGE_X,
         cfg.DRAW_IMAGE_Y,
@@ -348,7 +421,7 @@ def import_maze_from_file(image_boundary, maze_width, maze_height, block_width,
         maze_width,
         maze_height,
         block_width,
-        cfg.COLORS["teal"],
+        maze_color,
         cfg.COLORS["black"],
         maze_coords,
         screen,
@@ -358,12 +431,17 @@ def import_maze_from_file(image_boundary, maze_width, maze_height, block_width,
     )
 
     # Apply screen offsets
-    chosen_coords = [
-        (x + cfg.DRAW_IMAGE_X + image_boundary, y + cfg.DRAW_IMAGE_Y + image_boundary)
-        for x, y in maze_coords
-    ]
-    shifted_coords_history = chosen_coords.copy()
-
-    maze_color_index = 0
+    chosen_coords = OrderedCoords(
+        (
+            (
+                x + cfg.DRAW_IMAGE_X + image_boundary,
+                y + cfg.DRAW_IMAGE_Y + image_boundary,
+            )
+            for x, y in maze_coords
+        ),
+        block_width,
+    )
+    shifted_coords_history = OrderedCoords(chosen_coords)
+    occupancy_grid.reset(scale_coords(chosen_coords, image_boundary))
 
-    return chosen_coords, shifted_coords_history, maze_color_index
+    return chosen_coords, shifted_coords_history
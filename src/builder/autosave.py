@@ -0,0 +1,187 @@
+import os
+import queue
+import struct
+import threading
+import time
+from settings import config as cfg
+from fileio.export import write_file_atomic
+from builder.coords import OrderedCoords
+
+# Binary layouts: a snapshot holds the wall color index and path coordinates
+# of the maze, and a journal holds fixed size records of edits made since the
+# snapshot of the same generation
+SNAPSHOT_HEADER = struct.Struct("<4sIHI")
+SNAPSHOT_MAGIC = b"SASN"
+JOURNAL_HEADER = struct.Struct("<4sI")
+JOURNAL_MAGIC = b"SAJN"
+COORD_RECORD = struct.Struct("<hh")
+EDIT_RECORD = struct.Struct("<Bhh")
+EDIT_CODES = {"add": 1, "erase": 2, "color": 3}
+
+
+# Class to autosave the maze being drawn in the level builder. Edits are
+# appended to a journal by a background thread, which syncs them to disk in
+# batches, and a snapshot of the maze periodically replaces the journal. The
+# builder only queues work, so saving never holds up the input loop.
+class AutosaveJournal:
+    def __init__(self, directory_path):
+        self.journal_path = directory_path + cfg.FILES["autosave_journal"]
+        self.snapshot_path = directory_path + cfg.FILES["autosave_snapshot"]
+        os.makedirs(directory_path, exist_ok=True)
+
+        # Continue numbering from any previous session, so its journal is
+        # never replayed onto a newer snapshot
+        snapshot = read_autosave_file(
+            self.snapshot_path, SNAPSHOT_HEADER, SNAPSHOT_MAGIC
+        )
+        self.generation = snapshot[1] if snapshot else 0
+
+        self.pending = queue.Queue()
+        self.num_edits = 0
+        self.snapshot_requested = False
+        self.thread = threading.Thread(target=self.write_pending, daemon=True)
+        self.thread.start()
+
+    # Method to queue an edit for the journal, as an edit log entry
+    def write_edit(self, entry):
+        if entry[0] == "color":
+            record = EDIT_RECORD.pack(EDIT_CODES["color"], entry[1], entry[2])
+        else:
+            record = EDIT_RECORD.pack(EDIT_CODES[entry[0]], *entry[1])
+        self.pending.put(("edit", record))
+        self.num_edits += 1
+
+    # Method to ask for a snapshot, such as when the whole maze is replaced
+    def request_snapshot(self):
+        self.snapshot_requested = True
+
+    # Method to check if a snapshot should be written
+    def snapshot_due(self):
+        return self.snapshot_requested or self.num_edits >= cfg.AUTOSAVE_SNAPSHOT_EDITS
+
+    # Method to queue a snapshot of the maze, copying its coordinates so the
+    # background thread does not read them while they change
+    def write_snapshot(self, chosen_coords, maze_color_index):
+        self.pending.put(("snapshot", list(chosen_coords), maze_color_index))
+        self.num_edits = 0
+        self.snapshot_requested = False
+
+    # Method to write out queued work and stop the background thread
+    def close(self):
+        self.pending.put(None)
+        self.thread.join()
+
+    # Method run by the background thread to write queued work
+    def write_pending(self):
+        journal_file = None
+        unsynced = False
+        last_sync = time.monotonic()
+        while True:
+            try:
+                item = self.pending.get(timeout=cfg.AUTOSAVE_SYNC_SECONDS)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+
+            try:
+                if item and item[0] == "snapshot":
+                    if journal_file:
+                        journal_file.close()
+                    journal_file = self.start_generation(item[1], item[2])
+                    unsynced = False
+                    last_sync = time.monotonic()
+                elif item and journal_file:
+                    journal_file.write(item[1])
+                    unsynced = True
+
+                # Sync edits in batches rather than one at a time
+                sync_due = time.monotonic() - last_sync >= cfg.AUTOSAVE_SYNC_SECONDS
+                if unsynced and sync_due:
+                    sync_file(journal_file)
+                    unsynced = False
+                    last_sync = time.monotonic()
+            except OSError as e:
+                print(f"Error autosaving maze: {e}")
+
+        if journal_file:
+            try:
+                sync_file(journal_file)
+                journal_file.close()
+            except OSError as e:
+                print(f"Error autosaving maze: {e}")
+
+    # Method to write a snapshot and start a new journal after it, returning
+    # the journal file opened for appending
+    def start_generation(self, coords, maze_color_index):
+        self.generation += 1
+        snapshot = [
+            SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, self.generation, maze_color_index, len(coords)
+            )
+        ]
+        snapshot.extend(COORD_RECORD.pack(*coord) for coord in coords)
+        write_file_atomic(self.snapshot_path, b"".join(snapshot))
+        write_file_atomic(
+            self.journal_path, JOURNAL_HEADER.pack(JOURNAL_MAGIC, self.generation)
+        )
+        return open(self.journal_path, "ab")
+
+
+# Function to flush a file and sync it to disk
+def sync_file(file):
+    file.flush()
+    os.fsync(file.fileno())
+
+
+# Function to read an autosave file, returning its unpacked header followed
+# by the rest of its contents, or None if missing or not valid
+def read_autosave_file(file_path, header, magic):
+    try:
+        with open(file_path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < header.size:
+        return None
+    fields = header.unpack_from(data)
+    if fields[0] != magic:
+        return None
+    return (*fields, data[header.size :])
+
+
+# Function to load an autosaved maze by replaying its journal onto its
+# snapshot, returning the path coordinates and wall color index, or None if
+# there is nothing to recover
+def load_autosave(directory_path):
+    snapshot = read_autosave_file(
+        directory_path + cfg.FILES["autosave_snapshot"],
+        SNAPSHOT_HEADER,
+        SNAPSHOT_MAGIC,
+    )
+    if not snapshot:
+        return None
+    _, generation, maze_color_index, num_coords, data = snapshot
+    coord_data = data[: num_coords * COORD_RECORD.size]
+    maze_coords = OrderedCoords(COORD_RECORD.iter_unpack(coord_data))
+
+    # Replay journal of the same generation, ignoring a partly written record
+    journal = read_autosave_file(
+        directory_path + cfg.FILES["autosave_journal"],
+        JOURNAL_HEADER,
+        JOURNAL_MAGIC,
+    )
+    if journal and journal[1] == generation:
+        data = journal[2]
+        data = data[: len(data) - len(data) % EDIT_RECORD.size]
+        for code, first, second in EDIT_RECORD.iter_unpack(data):
+            if code == EDIT_CODES["add"]:
+                maze_coords.append((first, second))
+            elif code == EDIT_CODES["erase"] and (first, second) in maze_coords:
+                maze_coords.remove((first, second))
+            elif code == EDIT_CODES["color"]:
+                maze_color_index = second
+
+    if not maze_coords and not maze_color_index:
+        return None
+    return list(maze_coords), maze_color_index
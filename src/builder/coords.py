@@ -0,0 +1,107 @@
+# Marker for a removed coordinate's position, until positions are compacted
+REMOVED = None
+
+
+# Class to store unique coordinates in the order they were added, with
+# constant time membership, removal and index lookup. Removed coordinates
+# leave a gap which is skipped, and gaps are compacted once they make up
+# half of the positions. An index stays valid until a coordinate is removed,
+# as with a list. If a bucket size is given, coordinates are also grouped
+# into square buckets of that size to find those within an area.
+class OrderedCoords:
+    def __init__(self, coords=(), bucket_size=None):
+        self.slots = []
+        self.positions = {}
+        self.bucket_size = bucket_size
+        self.buckets = {}
+        for coord in coords:
+            self.append(coord)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, coord):
+        return coord in self.positions
+
+    def __iter__(self):
+        for coord in self.slots:
+            if coord is not REMOVED:
+                yield coord
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.slots)
+        if index < 0 or index >= len(self.slots) or self.slots[index] is REMOVED:
+            raise IndexError("coordinate index out of range")
+        return self.slots[index]
+
+    # Method to add a coordinate, moving it to the end if already present
+    def append(self, coord):
+        if coord in self.positions:
+            self.remove(coord)
+        self.positions[coord] = len(self.slots)
+        self.slots.append(coord)
+        if self.bucket_size:
+            self.buckets.setdefault(self.get_bucket(coord), {})[coord] = None
+
+    # Method to remove a coordinate
+    def remove(self, coord):
+        if coord not in self.positions:
+            raise ValueError(f"{coord} not in coordinates")
+        self.slots[self.positions.pop(coord)] = REMOVED
+        self.remove_from_bucket(coord)
+        self.trim()
+        if len(self.slots) > 2 * len(self.positions):
+            self.compact()
+
+    # Method to remove and return the last coordinate
+    def pop(self):
+        if not self.positions:
+            raise IndexError("pop from empty coordinates")
+        coord = self.slots.pop()
+        del self.positions[coord]
+        self.remove_from_bucket(coord)
+        self.trim()
+        return coord
+
+    # Method to get the index of a coordinate
+    def index(self, coord):
+        if coord not in self.positions:
+            raise ValueError(f"{coord} not in coordinates")
+        return self.positions[coord]
+
+    # Method to get coordinates within a rect, looking only in the buckets
+    # the rect covers
+    def get_coords_within(self, rect):
+        coords_within = []
+        bucket_left, bucket_top = self.get_bucket(rect.topleft)
+        bucket_right, bucket_bottom = self.get_bucket((rect.right - 1, rect.bottom - 1))
+        for bucket_x in range(bucket_left, bucket_right + 1):
+            for bucket_y in range(bucket_top, bucket_bottom + 1):
+                for coord in self.buckets.get((bucket_x, bucket_y), ()):
+                    if rect.collidepoint(coord):
+                        coords_within.append(coord)
+        return coords_within
+
+    # Helper method to get the bucket of a coordinate
+    def get_bucket(self, coord):
+        return (coord[0] // self.bucket_size, coord[1] // self.bucket_size)
+
+    # Helper method to remove a coordinate from its bucket
+    def remove_from_bucket(self, coord):
+        if self.bucket_size:
+            bucket = self.get_bucket(coord)
+            del self.buckets[bucket][coord]
+            if not self.buckets[bucket]:
+                del self.buckets[bucket]
+
+    # Helper method to drop gaps at the end, so the last slot is a coordinate
+    def trim(self):
+        while self.slots and self.slots[-1] is REMOVED:
+            self.slots.pop()
+
+    # Helper method to close all gaps, renumbering coordinate positions
+    def compact(self):
+        self.slots = list(self)
+        for index, coord in enumerate(self.slots):
+            self.positions[coord] = index
@@ -2,12 +2,13 @@ import pygame
 import time
 from settings import config as cfg
 from rect.utils import define_rect, shift_rect_to_divisible_pos
-from rect.draw import draw_square
+from rect.draw import draw_square, draw_asset_marker, update_dirty_rects
 from path.utils import (
     rect_within_boundary,
     rect_gives_uniform_path,
+    grid_window_gives_uniform_path,
 )
-from builder.utils import scale_coords
+from builder.utils import scale_coord
 
 # Function to process inputs for path drawing
 def process_path_inputs(
@@ -71,6 +72,8 @@ def draw_path(
     screen,
     dirty_rects,
     shifted_coords_history,
+    occupancy_grid,
+    edit_log,
     arrow_index,
 ):
 
@@ -101,8 +104,10 @@ def draw_path(
         arrow_index = chosen_coords.index(my_rect.center)
         for i in range(3):
             draw_square(my_rect, screen, cfg.COLORS["white"], dirty_rects)
+            update_dirty_rects(dirty_rects)
             time.sleep(1 / 30)
             draw_square(my_rect, screen, cfg.COLORS["black"], dirty_rects)
+            update_dirty_rects(dirty_rects)
             time.sleep(1 / 30)
     else:
         arrow_index = -1
@@ -111,21 +116,13 @@ def draw_path(
     flags.arrow_pressed = False
 
     # Coarsen inputs prior to checking maze grid to optimize runtime
-    coords_scaled = scale_coords(chosen_coords, image_boundary)
-    new_center = (
-        int((my_rect.center[0] - cfg.DRAW_IMAGE_X - image_boundary) / cfg.SCALE_FACTOR),
-        int((my_rect.center[1] - cfg.DRAW_IMAGE_Y - image_boundary) / cfg.SCALE_FACTOR),
-    )
+    new_center = scale_coord(my_rect.center, image_boundary)
     my_rect_scaled = define_rect(new_center, cfg.BLOCK_WIDTH)
 
-    # Check to make sure the current shifted position is not the same as
-    # the last, and that it's not in chosen coords. If all criteria met,
+    # Check to make sure the current shifted position is not in chosen
+    # coords, which includes the last one added. If all criteria met,
     # draw the new path square
-    if (
-        not shifted_coords_history or my_rect.center != shifted_coords_history[-1]
-    ) and my_rect.center not in chosen_coords:
-        shifted_coords_history.append(my_rect.center)
-
+    if my_rect.center not in chosen_coords:
         if rect_within_boundary(
             my_rect,
             cfg.DRAW_IMAGE_X,
@@ -134,7 +131,7 @@ def draw_path(
             maze_width,
             maze_height,
         ) and rect_gives_uniform_path(
-            coords_scaled,
+            occupancy_grid.get_tangent_centers(new_center),
             my_rect_scaled,
             cfg.MAZE_WIDTH,
             cfg.MAZE_HEIGHT,
@@ -144,8 +141,18 @@ def draw_path(
             cfg.BLOCK_WIDTH,
         ):
             # Add updated mouse position to list of previous points
-            chosen_coords.append((my_rect.center))
-            draw_square(my_rect, screen, cfg.COLORS["black"], dirty_rects)
+            add_path_rect(
+                my_rect.center,
+                chosen_coords,
+                shifted_coords_history,
+                occupancy_grid,
+                block_width,
+                image_boundary,
+                screen,
+                dirty_rects,
+                None,
+            )
+            edit_log.record(("add", my_rect.center))
 
     return flags, arrow_index
 
@@ -166,17 +173,39 @@ def erase_and_redraw(
     selected_color = maze_colors[maze_color_index]
     draw_square(my_rect, screen, selected_color, dirty_rects)
 
-    # Draw previous coordinates which were overlapping erased square
-    for coord in chosen_coords:
+    # Draw previous coordinates which were overlapping erased square,
+    # looking only at those centered within a block width of it
+    redrawn_rects = [my_rect]
+    for coord in chosen_coords.get_coords_within(
+        my_rect.inflate(block_width, block_width)
+    ):
         temp_rect = define_rect(coord, block_width)
         if temp_rect.colliderect(my_rect):
             draw_square(temp_rect, screen, cfg.COLORS["black"], dirty_rects)
+            redrawn_rects.append(temp_rect)
 
-    # Draw dots to help show path if color specified
+    # Draw dots to help show path if color specified, where drawn over
     if dot_color:
-        for coord in chosen_coords:
-            temp_rect = define_rect(coord, int(block_width / 12))
-            draw_square(temp_rect, screen, dot_color, dirty_rects)
+        redraw_dots(
+            redrawn_rects, block_width, screen, dirty_rects, chosen_coords, dot_color
+        )
+
+
+# Function to redraw the center dots of coordinates within drawn over rects
+def redraw_dots(
+    redrawn_rects, block_width, screen, dirty_rects, chosen_coords, dot_color
+):
+    dot_width = int(block_width / 12)
+    dot_rects = {}
+    for redrawn_rect in redrawn_rects:
+        for coord in chosen_coords.get_coords_within(
+            redrawn_rect.inflate(dot_width, dot_width)
+        ):
+            temp_rect = define_rect(coord, dot_width)
+            if temp_rect.colliderect(redrawn_rect):
+                dot_rects[coord] = temp_rect
+    for temp_rect in dot_rects.values():
+        draw_square(temp_rect, screen, dot_color, dirty_rects)
 
 
 # Function to erase path at current mouse location
@@ -186,6 +215,8 @@ def erase_path(
     image_boundary,
     shifted_coords_history,
     chosen_coords,
+    occupancy_grid,
+    edit_log,
     maze_colors,
     maze_color_index,
     screen,
@@ -203,90 +234,118 @@ def erase_path(
     )
 
     if my_rect.center in chosen_coords:
-        # Determine if removing this coordinate produces legal maze
-        temp_coords = chosen_coords.copy()
-        temp_coords.remove(my_rect.center)
-        # Coarsen inputs prior to checking maze grid to optimize runtime
-        coords_scaled = scale_coords(temp_coords, image_boundary)
-        if rect_gives_uniform_path(
-            coords_scaled,
-            None,
+        # Determine if removing this coordinate produces legal maze around
+        # it, restoring it in the grid afterwards
+        center_scaled = scale_coord(my_rect.center, image_boundary)
+        occupancy_grid.remove_block(center_scaled)
+        rows, cols = occupancy_grid.get_block_range(center_scaled)
+        legal_path = grid_window_gives_uniform_path(
+            occupancy_grid.maze_grid,
             cfg.MAZE_WIDTH,
             cfg.MAZE_HEIGHT,
-            0,
-            0,
-            0,
             cfg.BLOCK_WIDTH,
-        ):
-            # Remove chosen position and redraw around it
-            chosen_coords.remove(my_rect.center)
-            shifted_coords_history.remove(my_rect.center)
+            rows,
+            cols,
+        )
+        occupancy_grid.add_block(center_scaled)
 
-            erase_and_redraw(
+        if legal_path:
+            # Remove chosen position and redraw around it
+            remove_path_rect(
                 my_rect.center,
+                chosen_coords,
+                shifted_coords_history,
+                occupancy_grid,
                 block_width,
+                image_boundary,
                 maze_colors,
                 maze_color_index,
                 screen,
                 dirty_rects,
-                chosen_coords,
                 cfg.COLORS["white"],
             )
+            edit_log.record(("erase", my_rect.center))
 
 
-# Function to undo drawing of path rect
-def undo_path_rect(
+# Function to add a path rect and draw it
+def add_path_rect(
+    coord,
     chosen_coords,
     shifted_coords_history,
+    occupancy_grid,
     block_width,
+    image_boundary,
+    screen,
+    dirty_rects,
+    dot_color,
+):
+    chosen_coords.append(coord)
+    shifted_coords_history.append(coord)
+    occupancy_grid.add_block(scale_coord(coord, image_boundary))
+
+    my_rect = define_rect(coord, block_width)
+    draw_square(my_rect, screen, cfg.COLORS["black"], dirty_rects)
+
+    # Draw dots drawn over if color specified
+    if dot_color:
+        redraw_dots(
+            [my_rect], block_width, screen, dirty_rects, chosen_coords, dot_color
+        )
+
+
+# Function to remove a path rect and redraw around it
+def remove_path_rect(
+    coord,
+    chosen_coords,
+    shifted_coords_history,
+    occupancy_grid,
+    block_width,
+    image_boundary,
     maze_colors,
     maze_color_index,
     screen,
     dirty_rects,
-    flags,
+    dot_color,
 ):
-    # Remove last coordinate (undo)
-    last_coord = chosen_coords.pop()
-
-    # Remove last shifted coordinate from history
-    shifted_coords_history.pop()
+    chosen_coords.remove(coord)
+    if coord in shifted_coords_history:
+        shifted_coords_history.remove(coord)
+    occupancy_grid.remove_block(scale_coord(coord, image_boundary))
 
     erase_and_redraw(
-        last_coord,
+        coord,
         block_width,
         maze_colors,
         maze_color_index,
         screen,
         dirty_rects,
         chosen_coords,
-        None,
+        dot_color,
     )
 
-    # Reset flag for right click
-    flags.x_pressed = False
 
-    return flags
+# Function to place an asset and draw its marker
+def place_asset(asset, coord, asset_coords, block_width, screen, dirty_rects, font):
+    draw_asset_marker(
+        coord,
+        block_width,
+        asset["letter"],
+        asset["color"],
+        cfg.COLORS["black"],
+        font,
+        screen,
+        dirty_rects,
+    )
+    asset_coords.append(coord)
+    asset["location"] = coord
 
 
-# Function to undo last asset placement
-def undo_asset_placement(
-    asset_coords, asset_defs, block_width, screen, dirty_rects, flags
-):
-    # Get last coordinate
+# Function to remove the last placed asset, erasing its marker
+def remove_asset(asset, asset_coords, block_width, screen, dirty_rects):
+    # Assets are removed in reverse order of placement
     remove_asset_coord = asset_coords.pop()
-
-    # Set asset coordinate in dictionary to ()
-    for asset in asset_defs:
-        if asset.get("location") == remove_asset_coord:
-            asset["location"] = ()
-            break
+    asset["location"] = ()
 
     # Erase asset on maze by drawing black square
     temp_rect = define_rect(remove_asset_coord, block_width)
     draw_square(temp_rect, screen, cfg.COLORS["black"], dirty_rects)
-
-    # Reset flag for right click
-    flags.mouse_right_click = False
-
-    return flags
-
@@ -0,0 +1,105 @@
+import os
+import queue
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from settings import config as cfg
+from fileio.export import (
+    export_image,
+    export_path_coords_to_csv,
+    export_asset_coords_to_csv,
+    export_metadata,
+)
+
+
+# Class to export level files on a background thread, so the builder keeps
+# running while screenshots are encoded and files are written. Each file is
+# written straight into the level folder by way of a temporary file, and
+# progress is passed back through a queue for the builder loop to show.
+class LevelExporter:
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.export_future = None
+        self.progress = queue.Queue()
+        self.no_assets_screenshot = None
+
+    # Method to check if an export is still being written
+    def is_busy(self):
+        return self.export_future is not None and not self.export_future.done()
+
+    # Method to start exporting level files from copies of the level data
+    def export_level(
+        self,
+        destination_directory,
+        screenshot,
+        path_coords,
+        asset_defs,
+        maze_metadata,
+        image_boundary,
+    ):
+        self.export_future = self.executor.submit(
+            self.write_level_files,
+            destination_directory,
+            self.no_assets_screenshot,
+            screenshot,
+            list(path_coords),
+            [dict(asset) for asset in asset_defs],
+            dict(maze_metadata),
+            image_boundary,
+        )
+
+    # Method to get the latest progress of the export, or None if unchanged
+    def get_progress(self):
+        latest = None
+        while not self.progress.empty():
+            latest = self.progress.get()
+        return latest
+
+    # Method to wait for any export to finish and stop the background thread
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    # Method run by the background thread to write each level file
+    def write_level_files(
+        self,
+        destination_directory,
+        no_assets_screenshot,
+        screenshot,
+        path_coords,
+        asset_defs,
+        maze_metadata,
+        image_boundary,
+    ):
+        level_files = [
+            (cfg.FILES["screenshot_assets"], export_image, (screenshot,)),
+            (
+                cfg.FILES["path_coordinates"],
+                export_path_coords_to_csv,
+                (path_coords, cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary),
+            ),
+            (
+                cfg.FILES["asset_coordinates"],
+                export_asset_coords_to_csv,
+                (asset_defs, cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary),
+            ),
+            (cfg.FILES["metadata"], export_metadata, (maze_metadata,)),
+        ]
+        if no_assets_screenshot:
+            level_files.insert(
+                0,
+                (
+                    cfg.FILES["screenshot_no_assets"],
+                    export_image,
+                    (no_assets_screenshot,),
+                ),
+            )
+
+        try:
+            os.makedirs(destination_directory, exist_ok=True)
+            for index, (filename, export_file, args) in enumerate(level_files):
+                self.progress.put(("progress", index, len(level_files)))
+                export_file(*args, os.path.join(destination_directory, filename))
+                print(f"Saved '{filename}' to '{destination_directory}'")
+            self.progress.put(("done", len(level_files), len(level_files)))
+        except (OSError, ValueError, pygame.error) as e:
+            print(f"Error exporting level files: {e}")
+            self.progress.put(("failed", 0, len(level_files)))
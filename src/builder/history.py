@@ -0,0 +1,232 @@
+from settings import config as cfg
+from builder.draw import add_path_rect, remove_path_rect, place_asset, remove_asset
+from builder.action import recolor_maze
+
+# Kinds of edits undone and redone while drawing the maze or placing assets
+PATH_EDITS = ("add", "erase", "color")
+ASSET_EDITS = ("asset",)
+
+
+# Class to log level builder edits in order, as compact tuples which can be
+# replayed: ("add", coord), ("erase", coord), ("asset", letter, coord) and
+# ("color", old_index, new_index). Edits before the position are applied,
+# and those after it have been undone. Recording a new edit drops the
+# undone edits, as they no longer follow from the maze. If an autosave
+# journal is given, each change to the maze path or wall color is written
+# to it as the edit it makes.
+class EditLog:
+    def __init__(self, asset_defs, autosave_journal):
+        self.entries = []
+        self.position = 0
+        self.asset_lookup = {asset["letter"]: asset for asset in asset_defs}
+        self.autosave_journal = autosave_journal
+
+    # Method to record an edit which has just been applied
+    def record(self, entry):
+        del self.entries[self.position :]
+        self.entries.append(entry)
+        self.position += 1
+        self.journal_edit(entry)
+
+    # Method to step back over the last applied edit, returning it
+    def step_back(self):
+        self.position -= 1
+        entry = self.entries[self.position]
+        self.journal_edit(invert_edit(entry))
+        return entry
+
+    # Method to step forward over the next undone edit, returning it
+    def step_forward(self):
+        entry = self.entries[self.position]
+        self.position += 1
+        self.journal_edit(entry)
+        return entry
+
+    # Method to write an edit to the autosave journal if it changes the maze
+    def journal_edit(self, entry):
+        if self.autosave_journal and entry[0] in PATH_EDITS:
+            self.autosave_journal.write_edit(entry)
+
+    # Method to check if the last applied edit is one of the given kinds
+    def can_undo(self, kinds):
+        return self.position > 0 and self.entries[self.position - 1][0] in kinds
+
+    # Method to check if the next undone edit is one of the given kinds
+    def can_redo(self, kinds):
+        return (
+            self.position < len(self.entries)
+            and self.entries[self.position][0] in kinds
+        )
+
+    # Method to get the applied edits, for replaying the maze
+    def get_history(self):
+        return self.entries[: self.position]
+
+    # Method to drop all edits, such as when another maze is loaded
+    def clear(self):
+        self.entries.clear()
+        self.position = 0
+        if self.autosave_journal:
+            self.autosave_journal.request_snapshot()
+
+
+# Function to get the edit which reverts an edit
+def invert_edit(entry):
+    match entry[0]:
+        case "add":
+            return ("erase", entry[1])
+        case "erase":
+            return ("add", entry[1])
+        case "color":
+            return ("color", entry[2], entry[1])
+    return entry
+
+
+# Function to revert the last applied edit, returning the maze color index
+def undo_edit(
+    edit_log,
+    chosen_coords,
+    shifted_coords_history,
+    occupancy_grid,
+    asset_coords,
+    maze_colors,
+    maze_color_index,
+    maze_width,
+    maze_height,
+    block_width,
+    image_boundary,
+    screen,
+    dirty_rects,
+    fonts,
+    flags,
+):
+    entry = edit_log.step_back()
+
+    # Keep dots in place if currently shown for erasing
+    dot_color = cfg.COLORS["white"] if flags.draw_dots else None
+
+    match entry[0]:
+        case "add":
+            remove_path_rect(
+                entry[1],
+                chosen_coords,
+                shifted_coords_history,
+                occupancy_grid,
+                block_width,
+                image_boundary,
+                maze_colors,
+                maze_color_index,
+                screen,
+                dirty_rects,
+                dot_color,
+            )
+        case "erase":
+            add_path_rect(
+                entry[1],
+                chosen_coords,
+                shifted_coords_history,
+                occupancy_grid,
+                block_width,
+                image_boundary,
+                screen,
+                dirty_rects,
+                dot_color,
+            )
+        case "asset":
+            remove_asset(
+                edit_log.asset_lookup[entry[1]],
+                asset_coords,
+                block_width,
+                screen,
+                dirty_rects,
+            )
+        case "color":
+            maze_color_index = entry[1]
+            dirty_rects.append(
+                recolor_maze(
+                    screen,
+                    maze_colors[entry[2]],
+                    maze_colors[entry[1]],
+                    image_boundary,
+                    maze_width,
+                    maze_height,
+                )
+            )
+
+    return maze_color_index
+
+
+# Function to reapply the next undone edit, returning the maze color index
+def redo_edit(
+    edit_log,
+    chosen_coords,
+    shifted_coords_history,
+    occupancy_grid,
+    asset_coords,
+    maze_colors,
+    maze_color_index,
+    maze_width,
+    maze_height,
+    block_width,
+    image_boundary,
+    screen,
+    dirty_rects,
+    fonts,
+    flags,
+):
+    entry = edit_log.step_forward()
+
+    # Keep dots in place if currently shown for erasing
+    dot_color = cfg.COLORS["white"] if flags.draw_dots else None
+
+    match entry[0]:
+        case "add":
+            add_path_rect(
+                entry[1],
+                chosen_coords,
+                shifted_coords_history,
+                occupancy_grid,
+                block_width,
+                image_boundary,
+                screen,
+                dirty_rects,
+                dot_color,
+            )
+        case "erase":
+            remove_path_rect(
+                entry[1],
+                chosen_coords,
+                shifted_coords_history,
+                occupancy_grid,
+                block_width,
+                image_boundary,
+                maze_colors,
+                maze_color_index,
+                screen,
+                dirty_rects,
+                dot_color,
+            )
+        case "asset":
+            place_asset(
+                edit_log.asset_lookup[entry[1]],
+                entry[2],
+                asset_coords,
+                block_width,
+                screen,
+                dirty_rects,
+                fonts["small"],
+            )
+        case "color":
+            maze_color_index = entry[2]
+            dirty_rects.append(
+                recolor_maze(
+                    screen,
+                    maze_colors[entry[1]],
+                    maze_colors[entry[2]],
+                    image_boundary,
+                    maze_width,
+                    maze_height,
+                )
+            )
+
+    return maze_color_index
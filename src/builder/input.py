@@ -34,6 +34,9 @@ def process_input(
     asset_letters,
     asset_defs,
     shifted_coords_history,
+    occupancy_grid,
+    edit_log,
+    level_exporter,
 ):
     current_arrow = None
     flags.arrow_pressed = False
@@ -106,10 +109,14 @@ def process_input(
                 enemy_quantity,
                 enemy_index,
                 asset_defs,
+                level_exporter,
             )
         elif event.key == pygame.K_x and flags.maze_draw:
             flags.x_pressed = True
+        elif event.key == pygame.K_y:
+            flags.y_pressed = True
         elif event.key == pygame.K_w and flags.maze_draw:
+            maze_color_index_old = maze_color_index
             maze_color_index = change_maze_color(
                 screen,
                 maze_color_index,
@@ -118,6 +125,7 @@ def process_input(
                 maze_width,
                 maze_height,
             )
+            edit_log.record(("color", maze_color_index_old, maze_color_index))
         elif event.key == pygame.K_f and flags.maze_draw:
             level_speed_index = cycle_level_speed(
                 level_speed_index, screen, dirty_rects, fonts
@@ -137,12 +145,18 @@ def process_input(
         elif event.key == pygame.K_ESCAPE and flags.maze_draw:
             chosen_coords, shifted_coords_history, maze_color_index = (
                 import_maze_from_file(
-                    image_boundary, maze_width, maze_height, block_width, screen
+                    image_boundary,
+                    maze_width,
+                    maze_height,
+                    block_width,
+                    screen,
+                    occupancy_grid,
                 )
             )
+            edit_log.clear()
         elif event.key == pygame.K_a and flags.maze_draw:
             asset_letters, asset_defs = init_asset_placement(
-                chosen_coords,
+                occupancy_grid,
                 image_boundary,
                 maze_width,
                 maze_height,
@@ -151,12 +165,14 @@ def process_input(
                 fonts,
                 asset_letters,
                 asset_defs,
+                level_exporter,
             )
         elif not flags.maze_draw and event.unicode.lower() in asset_letters:
             asset_defs = assign_asset_loc(
                 event,
                 asset_coords,
                 chosen_coords,
+                occupancy_grid,
                 dirty_rects,
                 screen,
                 maze_width,
@@ -166,6 +182,7 @@ def process_input(
                 block_width,
                 fonts,
                 asset_defs,
+                edit_log,
             )
 
     return (
@@ -2,7 +2,12 @@ import os
 import pygame
 import tkinter as tk
 from settings import config as cfg
-from fileio.load import import_image_dir
+from fileio.load import import_image_atlas, import_scaled_image_dir
+from grid.occupancy import OccupancyGrid
+from builder.coords import OrderedCoords
+from builder.history import EditLog
+from builder.autosave import AutosaveJournal
+from builder.exporter import LevelExporter
 
 
 # Function to initialize pygame modules and screen
@@ -52,17 +57,27 @@ def builder_init():
     # List of dirty rectangles, representing areas of screen to be updated
     dirty_rects = []
 
-    # List of mouse coordinates that have been added
-    chosen_coords = []
+    # Mouse coordinates that have been added, in order
+    chosen_coords = OrderedCoords(bucket_size=block_width)
 
     # Track previous shifted coordinate history
-    shifted_coords_history = []
+    shifted_coords_history = OrderedCoords()
+
+    # Grid of the maze path, updated as coordinates are added and removed
+    occupancy_grid = OccupancyGrid(cfg.MAZE_WIDTH, cfg.MAZE_HEIGHT, cfg.BLOCK_WIDTH)
 
     # List of assets and asset coordinates that have been added
     asset_coords = []
     asset_letters = []
     asset_defs = cfg.ASSET_DEFS.copy()
 
+    # Journal to autosave the maze, and log of edits for undo and redo
+    autosave_journal = AutosaveJournal(cfg.DIRS["autosave"])
+    edit_log = EditLog(asset_defs, autosave_journal)
+
+    # Exporter to write level files in the background
+    level_exporter = LevelExporter()
+
     # Fill background with white color
     screen.fill(cfg.COLORS["white"])
 
@@ -82,9 +97,13 @@ def builder_init():
         dirty_rects,
         chosen_coords,
         shifted_coords_history,
+        occupancy_grid,
         asset_coords,
         asset_letters,
         asset_defs,
+        edit_log,
+        autosave_journal,
+        level_exporter,
     )
 
 
@@ -121,15 +140,18 @@ def init_enemies():
     enemy_index["pumpkin"] = 0
 
     # Load enemy images and scale them
-    images = import_image_dir(cfg.DIRS["images"])
-    for image in images:
-        images[image] = pygame.transform.scale(
-            images[image],
-            (
-                int(images[image].get_width() * cfg.SCALE_FACTOR),
-                int(images[image].get_height() * cfg.SCALE_FACTOR),
-            ),
+    images = import_image_atlas(
+        cfg.DIRS["images"],
+        cfg.DIRS["atlas"] + cfg.FILES["atlas_image"],
+        cfg.DIRS["atlas"] + cfg.FILES["atlas_index"],
+        cfg.SCALE_FACTOR,
+        cfg.DIRS["cache"],
+    )
+    if not images:
+        images = import_scaled_image_dir(
+            cfg.DIRS["images"], cfg.SCALE_FACTOR, cfg.DIRS["cache"]
         )
+    for image in images:
         # Make teal the transparent color
         images[image].set_colorkey(cfg.COLORS["replace_teal"])
 
@@ -199,4 +221,5 @@ class Flags:
         self.arrow_pressed = False
         self.maze_draw = True
         self.x_pressed = True
+        self.y_pressed = False
         self.draw_dots = False
@@ -4,10 +4,12 @@ from settings import config as cfg
 def scale_coords(coords, image_boundary):
     coords_scaled = []
     for coord in coords:
-        coords_scaled.append(
-            (
-                int((coord[0] - cfg.DRAW_IMAGE_X - image_boundary) / cfg.SCALE_FACTOR),
-                int((coord[1] - cfg.DRAW_IMAGE_Y - image_boundary) / cfg.SCALE_FACTOR),
-            )
-        )
-    return coords_scaled
\ No newline at end of file
+        coords_scaled.append(scale_coord(coord, image_boundary))
+    return coords_scaled
+
+# Function to scale a single coordinate
+def scale_coord(coord, image_boundary):
+    return (
+        int((coord[0] - cfg.DRAW_IMAGE_X - image_boundary) / cfg.SCALE_FACTOR),
+        int((coord[1] - cfg.DRAW_IMAGE_Y - image_boundary) / cfg.SCALE_FACTOR),
+    )
\ No newline at end of file
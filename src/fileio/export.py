@@ -1,48 +1,67 @@
+import io
 import os
 import shutil
 import csv
+import pygame
 from settings import config as cfg
+from fileio.load import get_file_hash
 
 
 # Function to export path coordinates to csv file, adjusted for the offset
 # due to image position and boundary
-def export_path_coords_to_csv(coords, draw_image_x, draw_image_y, image_boundary):
+def export_path_coords_to_csv(
+    coords, draw_image_x, draw_image_y, image_boundary, csv_path
+):
     shifted_coords = [
         (t[0] - (draw_image_x + image_boundary), t[1] - (draw_image_y + image_boundary))
         for t in coords
     ]
 
-    with open(cfg.FILES["path_coordinates"], "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["X", "Y"])  # Write header row
-        writer.writerows(shifted_coords)
+    csvfile = io.StringIO(newline="")
+    writer = csv.writer(csvfile)
+    writer.writerow(["X", "Y"])  # Write header row
+    writer.writerows(shifted_coords)
+    write_file_atomic(csv_path, csvfile.getvalue().encode())
 
 
 # Function to export asset coordinates to csv file, adjusted for the offset
 # due to image position and boundary
-def export_asset_coords_to_csv(asset_defs, draw_image_x, draw_image_y, image_boundary):
+def export_asset_coords_to_csv(
+    asset_defs, draw_image_x, draw_image_y, image_boundary, csv_path
+):
     # If location specified, adjust for offset
+    shifted_asset_defs = []
     for asset in asset_defs:
+        shifted_asset = dict(asset)
         if asset.get("location"):
-            asset["location"] = (
+            shifted_asset["location"] = (
                 asset["location"][0] - (draw_image_x + image_boundary),
                 asset["location"][1] - (draw_image_y + image_boundary),
             )
+        shifted_asset_defs.append(shifted_asset)
 
     fieldnames = asset_defs[0].keys()
-    with open(cfg.FILES["asset_coordinates"], "w", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(asset_defs)
+    csvfile = io.StringIO(newline="")
+    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(shifted_asset_defs)
+    write_file_atomic(csv_path, csvfile.getvalue().encode())
 
 
 # Function to export dictionary containing metadata
-def export_metadata(maze_metadata):
-    fieldnames = maze_metadata.keys()
-    with open(cfg.FILES["metadata"], "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(maze_metadata.keys())
-        writer.writerow(maze_metadata.values())
+def export_metadata(maze_metadata, csv_path):
+    csvfile = io.StringIO(newline="")
+    writer = csv.writer(csvfile)
+    writer.writerow(maze_metadata.keys())
+    writer.writerow(maze_metadata.values())
+    write_file_atomic(csv_path, csvfile.getvalue().encode())
+
+
+# Function to export an image as a png file
+def export_image(image_surface, image_path):
+    image_file = io.BytesIO()
+    pygame.image.save(image_surface, image_file, "png")
+    write_file_atomic(image_path, image_file.getvalue())
 
 
 # Function to export dictionary containing settings
@@ -63,24 +82,6 @@ def export_maze_grid_to_txt(maze_grid):
     f.close()
 
 
-# Move files to another directory
-def move_files(source_directory, destination_directory):
-    if not os.path.exists(destination_directory):
-        os.makedirs(destination_directory)
-
-    for filename in os.listdir(source_directory):
-        # Check if the file ends with .csv or .txt or .png
-        if filename.endswith((".csv", ".txt", ".png")):
-            source_path = os.path.join(source_directory, filename)
-            destination_path = os.path.join(destination_directory, filename)
-
-            try:
-                shutil.move(source_path, destination_path)
-                print(f"Moved '{filename}' to '{destination_directory}'")
-            except Exception as e:
-                print(f"Error moving '{filename}': {e}")
-
-
 # Move specified file to another directory
 def move_one_file(source_file, source_directory, destination_directory):
     if not os.path.exists(destination_directory):
@@ -97,3 +98,64 @@ def move_one_file(source_file, source_directory, destination_directory):
                 print(f"Moved '{filename}' to '{destination_directory}'")
             except Exception as e:
                 print(f"Error moving '{filename}': {e}")
+
+
+# Function to write a file by way of a temporary file, flushed to disk before
+# replacing the file so a crash never leaves it partially written
+def write_file_atomic(file_path, data):
+    temp_file = f"{file_path}.{os.getpid()}.tmp"
+    with open(temp_file, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_file, file_path)
+
+
+# Function to pack all png images in a directory into one atlas image, with
+# a csv index of each image's name, location within the atlas, and the
+# size, modified time and hash of its file
+def export_sprite_atlas(directory_path, atlas_image_path, atlas_index_path, columns):
+    images = {}
+    image_files = {}
+    for filename in sorted(os.listdir(directory_path)):
+        if filename.lower().endswith(".png"):
+            image_name = os.path.splitext(filename)[0]
+            image_path = os.path.join(directory_path, filename)
+            images[image_name] = pygame.image.load(image_path)
+            image_files[image_name] = (os.stat(image_path), get_file_hash(image_path))
+
+    # Place images in a grid of equal cells, with unused space transparent
+    cell_width = max(image.get_width() for image in images.values())
+    cell_height = max(image.get_height() for image in images.values())
+    rows = -(-len(images) // columns)
+    atlas_surface = pygame.Surface(
+        (columns * cell_width, rows * cell_height), pygame.SRCALPHA
+    )
+    atlas_surface.fill(cfg.COLORS["replace_teal"])
+    atlas_index = []
+    for index, (image_name, image) in enumerate(images.items()):
+        image_rect = image.get_rect(
+            topleft=((index % columns) * cell_width, (index // columns) * cell_height)
+        )
+        # Adding onto a cleared cell copies pixels exactly, without blending
+        atlas_surface.fill((0, 0, 0, 0), image_rect)
+        atlas_surface.blit(image, image_rect, special_flags=pygame.BLEND_RGBA_ADD)
+        atlas_index.append(
+            {
+                "name": image_name,
+                "x": image_rect.x,
+                "y": image_rect.y,
+                "width": image_rect.width,
+                "height": image_rect.height,
+                "size": image_files[image_name][0].st_size,
+                "mtime": image_files[image_name][0].st_mtime_ns,
+                "hash": image_files[image_name][1],
+            }
+        )
+
+    os.makedirs(os.path.dirname(atlas_image_path), exist_ok=True)
+    pygame.image.save(atlas_surface, atlas_image_path)
+    with open(atlas_index_path, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=atlas_index[0].keys())
+        writer.writeheader()
+        writer.writerows(atlas_index)
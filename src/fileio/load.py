@@ -1,6 +1,9 @@
 import os
 import csv
+import struct
+import hashlib
 import pygame
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Loads all png images from a directory and stores in a list
@@ -18,19 +21,198 @@ def import_image_dir(directory_path):
     return loaded_images
 
 
-# Loads all wav sound files from a directory and stores in a list
+# Loads all png images from a directory in a pool of threads, scaled by the
+# given factor, and stores in a list. Scaled pixels are cached by file hash
+# and scale factor, so later starts skip decoding and scaling.
+def import_scaled_image_dir(directory_path, scale_factor, cache_path):
+    image_paths = {}
+    for filename in os.listdir(directory_path):
+        if filename.lower().endswith(".png"):
+            image_name = os.path.splitext(filename)[0]
+            image_paths[image_name] = os.path.join(directory_path, filename)
+
+    with ThreadPoolExecutor() as executor:
+        image_surfaces = executor.map(
+            load_scaled_image,
+            image_paths.values(),
+            [scale_factor] * len(image_paths),
+            [cache_path] * len(image_paths),
+        )
+
+    # Convert on the main thread, which owns the display
+    loaded_images = {}
+    for image_name, image_surface in zip(image_paths, image_surfaces):
+        if image_surface is not None:
+            loaded_images[image_name] = image_surface.convert()
+    return loaded_images
+
+
+# Loads images packed by export_sprite_atlas, scaled by the given factor, as
+# subsurfaces of a single atlas surface. No images are returned if the atlas
+# is missing, or its index does not match the png images in the directory.
+def import_image_atlas(
+    directory_path, atlas_image_path, atlas_index_path, scale_factor, cache_path
+):
+    if not (os.path.isfile(atlas_image_path) and os.path.isfile(atlas_index_path)):
+        return {}
+    atlas_index = read_csv_dict(atlas_index_path)
+    if not atlas_index_is_current(directory_path, atlas_index, cache_path):
+        print(f"Sprite atlas out of date, loading images from {directory_path}")
+        return {}
+
+    atlas_surface = load_scaled_image(atlas_image_path, scale_factor, cache_path)
+    if atlas_surface is None:
+        return {}
+    atlas_surface = atlas_surface.convert()
+
+    loaded_images = {}
+    for row in atlas_index:
+        image_rect = pygame.Rect(
+            int(row["x"]) * scale_factor,
+            int(row["y"]) * scale_factor,
+            int(row["width"]) * scale_factor,
+            int(row["height"]) * scale_factor,
+        )
+        loaded_images[row["name"]] = atlas_surface.subsurface(image_rect)
+    return loaded_images
+
+
+# Function to check an atlas index lists the name, size and contents of each
+# png image in a directory. Files are only hashed if their modified time
+# differs from the index, such as after a fresh checkout, and the modified
+# times of files found unchanged are cached with their hash so they are not
+# hashed again.
+def atlas_index_is_current(directory_path, atlas_index, cache_path):
+    try:
+        image_files = {
+            os.path.splitext(entry.name)[0]: (entry.path, entry.stat())
+            for entry in os.scandir(directory_path)
+            if entry.name.lower().endswith(".png")
+        }
+    except OSError:
+        return False
+    if {row["name"] for row in atlas_index} != set(image_files):
+        return False
+
+    checked_file = os.path.join(cache_path, "atlas_mtimes.csv")
+    checked_mtimes = {}
+    if os.path.isfile(checked_file):
+        for row in read_csv_dict(checked_file):
+            checked_mtimes[row.get("name")] = (row.get("mtime"), row.get("hash"))
+
+    num_hashed = 0
+    for row in atlas_index:
+        image_path, image_stat = image_files[row["name"]]
+        if str(image_stat.st_size) != row.get("size"):
+            return False
+        mtime = str(image_stat.st_mtime_ns)
+        if mtime == row.get("mtime") or checked_mtimes.get(row["name"]) == (
+            mtime,
+            row.get("hash"),
+        ):
+            continue
+        try:
+            if get_file_hash(image_path) != row.get("hash"):
+                return False
+        except OSError:
+            return False
+        checked_mtimes[row["name"]] = (mtime, row.get("hash"))
+        num_hashed += 1
+
+    # Write to a temporary file first so a partial cache is never read
+    if num_hashed:
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            temp_file = f"{checked_file}.{os.getpid()}.tmp"
+            with open(temp_file, "w", newline="") as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(["name", "mtime", "hash"])
+                writer.writerows(
+                    (row["name"], *checked_mtimes.get(row["name"], (None, None)))
+                    for row in atlas_index
+                )
+            os.replace(temp_file, checked_file)
+        except OSError as e:
+            print(f"Error caching sprite atlas check: {e}")
+    return True
+
+
+# Function to get a hash of the contents of a file
+def get_file_hash(file_path):
+    with open(file_path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+# Function to load one image scaled by the given factor, from the cache if
+# an entry exists for the file contents and factor, else by decoding it
+def load_scaled_image(image_path, scale_factor, cache_path):
+    try:
+        file_hash = get_file_hash(image_path)
+    except OSError as e:
+        print(f"Error loading image: {image_path}: {e}")
+        return None
+    cache_file = os.path.join(cache_path, f"{file_hash}_{scale_factor}.raw")
+
+    try:
+        with open(cache_file, "rb") as file:
+            width, height = struct.unpack("<II", file.read(8))
+            return pygame.image.frombytes(file.read(), (width, height), "RGB")
+    except (OSError, struct.error, ValueError):
+        pass
+
+    try:
+        image_surface = pygame.image.load(image_path)
+    except pygame.error as e:
+        print(f"Error loading image: {image_path}: {e}")
+        return None
+    if scale_factor != 1:
+        image_surface = pygame.transform.scale(
+            image_surface,
+            (
+                int(image_surface.get_width() * scale_factor),
+                int(image_surface.get_height() * scale_factor),
+            ),
+        )
+
+    # Write to a temporary file first so a partial entry is never read
+    try:
+        os.makedirs(cache_path, exist_ok=True)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, "wb") as file:
+            file.write(struct.pack("<II", *image_surface.get_size()))
+            file.write(pygame.image.tobytes(image_surface, "RGB"))
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        print(f"Error caching image: {image_path}: {e}")
+    return image_surface
+
+
+# Class to store sound effects by name, each loaded on its first use
+class SoundDict(dict):
+    def __init__(self, sound_paths):
+        super().__init__()
+        self.sound_paths = sound_paths
+
+    # Method to load a sound effect the first time it is requested
+    def __missing__(self, sound_name):
+        sound_path = self.sound_paths[sound_name]
+        try:
+            sound_effect = pygame.mixer.Sound(sound_path)
+        except pygame.error as e:
+            print(f"Error loading sound: {sound_path}: {e}")
+            raise KeyError(sound_name) from e
+        self[sound_name] = sound_effect
+        return sound_effect
+
+
+# Finds all wav sound files in a directory and stores them to load on use
 def import_sound_dir(directory_path):
-    loaded_sounds = {}
+    sound_paths = {}
     for filename in os.listdir(directory_path):
         if filename.lower().endswith(".wav"):
-            sound_path = os.path.join(directory_path, filename)
-            try:
-                sound_effect = pygame.mixer.Sound(sound_path)
-                sound_name = os.path.splitext(filename)[0]
-                loaded_sounds[sound_name] = sound_effect
-            except pygame.error as e:
-                print(f"Error loading sound: {filename}: {e}")
-    return loaded_sounds
+            sound_name = os.path.splitext(filename)[0]
+            sound_paths[sound_name] = os.path.join(directory_path, filename)
+    return SoundDict(sound_paths)
 
 
 # Saves paths associated with levels at a given directory if appropriate
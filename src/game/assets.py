@@ -1,7 +1,7 @@
-import time
 from settings import config as cfg
 from asset.sprite import Sprite
 from asset.enemy import Enemy
+from asset.broadphase import SpatialHash
 
 
 # Function to initialize and return items
@@ -52,16 +52,27 @@ def init_enemies(
     return enemy_list
 
 
+# Function to initialize spatial hashes for enemy and barrier collisions,
+# using cells the size of a path block
+def init_spatial_hashes(enemies, barrier_sprites, block_width, maze_factor):
+    spatial_hashes = {}
+    spatial_hashes["enemies"] = SpatialHash(int(block_width / maze_factor))
+    for enemy in enemies:
+        spatial_hashes["enemies"].insert(enemy)
+    spatial_hashes["barriers"] = SpatialHash(int(block_width / maze_factor))
+    for barrier in barrier_sprites.values():
+        spatial_hashes["barriers"].insert(barrier)
+    return spatial_hashes
+
+
 # Function to initialize variables and flags after creating assets
 def set_asset_flags(flags):
-    start_time = time.time()
     projectile = []
     blast = []
-    spawned_enemies = 0
     flags.rungame = True
     flags.exit_found = False
     flags.screen_change = True
     flags.create_sprites = False
     flags.exit_sound_played = False
 
-    return start_time, projectile, blast, spawned_enemies, flags
+    return projectile, blast, flags
@@ -0,0 +1,56 @@
+import time
+from settings import config as cfg
+from fileio.export import export_settings, move_one_file
+from fileio.load import read_csv_dict
+
+
+# Class to measure the work time of game loop frames for the "auto" maze
+# fidelity option. Once a window of frames is full, a high percentile of
+# frame time is compared with the game tick to decide whether the current
+# maze factor can be sustained.
+class FidelityMonitor:
+    def __init__(self, game_tick):
+        self.game_tick = game_tick
+        self.window_size = max(1, int(cfg.AUTO_FIDELITY_SECONDS / game_tick))
+        self.frame_times = []
+        self.frame_start = None
+
+    # Method to mark the start of a frame's work
+    def start_frame(self):
+        self.frame_start = time.perf_counter()
+
+    # Method to mark the end of a frame's work, returning True if a full
+    # window of frames shows the game tick is not being sustained
+    def end_frame(self):
+        if self.frame_start is None:
+            return False
+        self.frame_times.append(time.perf_counter() - self.frame_start)
+        self.frame_start = None
+        if len(self.frame_times) < self.window_size:
+            return False
+        self.frame_times.sort()
+        index = int(cfg.AUTO_FIDELITY_PERCENTILE * (len(self.frame_times) - 1))
+        percentile_time = self.frame_times[index]
+        self.frame_times.clear()
+        return percentile_time > self.game_tick * cfg.AUTO_FIDELITY_TOLERANCE
+
+
+# Function to get the next coarser maze factor, or None if already coarsest
+def get_coarser_maze_factor(maze_factor):
+    coarser_factors = [
+        factor
+        for factor in cfg.MAZE_FIDELITY_FACTORS
+        if factor is not None and factor > maze_factor
+    ]
+    if coarser_factors:
+        return min(coarser_factors)
+    return None
+
+
+# Function to save the maze fidelity chosen in auto mode to the settings file
+def save_auto_fidelity(maze_factor):
+    settings = read_csv_dict(cfg.DIRS["settings"] + cfg.FILES["settings"])
+    index = cfg.MAZE_FIDELITY_FACTORS.index(maze_factor)
+    settings[0]["auto_fidelity"] = cfg.MAZE_FIDELITY_OPTS[index]
+    export_settings(settings[0])
+    move_one_file(cfg.FILES["settings"], ".", cfg.DIRS["settings"])
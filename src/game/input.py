@@ -23,8 +23,9 @@ def process_input(
     screen,
     sounds,
     game_time,
-    start_time,
     pause_start,
+    scheduler,
+    spawn_scheduler,
 ):
     pause_delta = 0
     if event.type == pygame.QUIT:
@@ -51,13 +52,15 @@ def process_input(
             export_settings(settings[0])
             move_one_file(cfg.FILES["settings"], ".", cfg.DIRS["settings"])
         if event.key == pygame.K_PAUSE:
-            # Adjust game loop start timer based on pause behavior
+            # Delay pending enemy spawns and timed pauses by the time spent
+            # paused
             if not flags.paused:
                 pause_start = time.time()
             else:
                 pause_end = time.time()
                 pause_delta = pause_end - pause_start
-                start_time += pause_delta
+                spawn_scheduler.postpone(pause_delta)
+                scheduler.postpone(pause_delta)
 
             # Pause or unpause, and reset flag for printing text
             flags.paused = not flags.paused
@@ -89,7 +92,9 @@ def process_input(
             flags.f10_pressed = False
         if event.key == pygame.K_ESCAPE and flags.escape_pressed:
             flags.escape_pressed = False
-            flags, level_index, score, lives = end_game(flags, fonts, screen, sounds)
+            flags, level_index, score, lives = end_game(
+                flags, fonts, screen, sounds, scheduler
+            )
         if event.key == pygame.K_F1 and flags.f1_pressed:
             flags.f1_pressed = False
         if (
@@ -106,7 +111,6 @@ def process_input(
         key_order,
         controls_option,
         flags,
-        start_time,
         pause_start,
         pause_delta,
     )
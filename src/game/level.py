@@ -1,9 +1,55 @@
 import ast
+import pygame
 from settings import config as cfg
+from fileio.load import read_csv_dict, read_csv_path
 from utils.exceptions import CustomError
 from grid.utils import invert_maze_to_grid
 
 
+# Function to read the asset, metadata, and path files of a level
+def load_level_files(levels, level_index):
+    maze_assets = read_csv_dict(levels[level_index].get("assets"))
+    maze_metadata = read_csv_dict(levels[level_index].get("metadata"))[0]
+    maze_path = read_csv_path(levels[level_index].get("path"))
+    return maze_assets, maze_metadata, maze_path
+
+
+# Function to recolor images with a level's sprite colors. Images sliced from
+# one atlas are recolored in a single pass over a copy of the atlas.
+def colorize_images(images, sprite_metadata):
+    atlas_surfaces = {images[image].get_parent() for image in images}
+    if len(atlas_surfaces) == 1 and None not in atlas_surfaces:
+        atlas_copy = recolor_surface(atlas_surfaces.pop().copy(), sprite_metadata)
+        colorized_images = {}
+        for image in images:
+            image_copy = atlas_copy.subsurface(
+                images[image].get_offset(), images[image].get_size()
+            )
+            image_copy.set_colorkey(images[image].get_colorkey())
+            colorized_images[image] = image_copy
+        return colorized_images
+
+    colorized_images = {}
+    for image in images:
+        colorized_images[image] = recolor_surface(images[image].copy(), sprite_metadata)
+    return colorized_images
+
+
+# Function to replace the blue and red of a surface with a level's colors
+def recolor_surface(surface, sprite_metadata):
+    pixel_array = pygame.PixelArray(surface)
+    pixel_array.replace(cfg.COLORS["blue"], cfg.COLORS["replace_blue"])
+    pixel_array.replace(cfg.COLORS["red"], cfg.COLORS["replace_red"])
+    pixel_array.replace(
+        cfg.COLORS["replace_blue"], cfg.COLORS[sprite_metadata["first_color"]]
+    )
+    pixel_array.replace(
+        cfg.COLORS["replace_red"], cfg.COLORS[sprite_metadata["second_color"]]
+    )
+    del pixel_array
+    return surface
+
+
 # Function to print text next to maze
 def print_level_text(screen, levels, level_index, fonts, flags, controls_option):
     # Print level info
@@ -1,3 +1,4 @@
+import heapq
 import time
 import pygame
 from settings import config as cfg
@@ -5,15 +6,135 @@ from asset.sprite import Sprite
 from path.pathfind import create_flow_field
 
 
+# Class to hold short-lived sprites (projectiles and blasts) which are out
+# of play, so that they are reset and handed out again instead of rebuilt
+class SpritePool:
+    def __init__(self):
+        self.free_sprites = {}
+
+    # Method to get a sprite, recycling a released one of the same name if possible
+    def acquire(
+        self,
+        name,
+        image,
+        center_position,
+        speed,
+        can_rotate,
+        hitbox_width,
+        path_width,
+        rotate_image,
+    ):
+        free_sprites = self.free_sprites.get(name)
+        if free_sprites:
+            sprite = free_sprites.pop()
+            sprite.recycle(
+                image,
+                center_position,
+                speed,
+                can_rotate,
+                hitbox_width,
+                path_width,
+                rotate_image,
+            )
+            return sprite
+        return Sprite(
+            name,
+            image,
+            center_position,
+            speed,
+            can_rotate,
+            hitbox_width,
+            path_width,
+            rotate_image,
+        )
+
+    # Method to return a sprite to the pool once it is out of play
+    def release(self, sprite):
+        if not sprite:
+            return
+        free_sprites = self.free_sprites.setdefault(sprite.name, [])
+        if not any(free_sprite is sprite for free_sprite in free_sprites):
+            free_sprites.append(sprite)
+
+
+# Class to schedule timed events on a heap ordered by due time, so that the
+# game loop waits out pauses while still pumping events. Pauses run back to
+# back, and the game loop is paused until the last scheduled pause is due.
+class Scheduler:
+    def __init__(self):
+        self.events = []
+        self.next_order = 0
+        self.pause_end = 0
+        self.num_pauses = 0
+
+    # Method to schedule an event to be due after a delay in seconds
+    def schedule(self, name, delay):
+        self._push(time.time() + delay, name, False)
+
+    # Method to schedule a pause, starting once earlier pauses have ended
+    def schedule_pause(self, name, delay):
+        self.pause_end = max(time.time(), self.pause_end) + delay
+        self.num_pauses += 1
+        self._push(self.pause_end, name, True)
+
+    # Method to remove and return names of events which are due, in due order
+    def pop_due(self):
+        now = time.time()
+        due_events = []
+        while self.events and self.events[0][0] <= now:
+            _, _, name, is_pause = heapq.heappop(self.events)
+            if is_pause:
+                self.num_pauses -= 1
+            due_events.append(name)
+        return due_events
+
+    # Method to return whether a pause is still pending
+    def is_pausing(self):
+        return self.num_pauses > 0
+
+    # Method to return whether an event of a given name is pending
+    def is_scheduled(self, name):
+        return any(event[2] == name for event in self.events)
+
+    # Method to delay all pending events, such as after the game is unpaused.
+    # Shifting every due time equally keeps the heap ordered.
+    def postpone(self, delay):
+        self.events = [
+            (due_time + delay, order, name, is_pause)
+            for due_time, order, name, is_pause in self.events
+        ]
+        if self.pause_end:
+            self.pause_end += delay
+
+    # Method to cancel all pending events
+    def clear(self):
+        self.events.clear()
+        self.pause_end = 0
+        self.num_pauses = 0
+
+    # Helper method to add an event to the heap, where the order breaks ties
+    # so that events due at the same time are returned as scheduled
+    def _push(self, due_time, name, is_pause):
+        heapq.heappush(self.events, (due_time, self.next_order, name, is_pause))
+        self.next_order += 1
+
+
 # Function to reset player and enemies after player destroyed
-def reset_actors(flags, player, corns, tomatoes, pumpkins, asset_coord):
+def reset_actors(
+    flags,
+    player,
+    enemies,
+    asset_coord,
+    projectile,
+    blast,
+    sprite_pool,
+    spawn_scheduler,
+    seconds_to_spawn,
+):
     # Move player and enemies to respawn if player collided with enemy
     flags.screen_change = True
     player.reset(asset_coord.get("R")[0], asset_coord.get("R")[1])
     player.toggle_spawn()
-    start_time = time.time()
-    spawned_enemies = 0
-    enemies = corns + tomatoes + pumpkins
     for enemy in enemies:
         enemy.reset(asset_coord.get("E")[0], asset_coord.get("E")[1])
         if enemy.can_spawn():
@@ -22,27 +143,33 @@ def reset_actors(flags, player, corns, tomatoes, pumpkins, asset_coord):
             enemy.reset_image()
         if enemy.has_seen_player():
             enemy.toggle_seen_player()
+    sprite_pool.release(projectile)
+    sprite_pool.release(blast)
     projectile = []
     blast = []
     flow_field = None
+    schedule_spawns(spawn_scheduler, seconds_to_spawn, len(enemies))
+
+    return projectile, blast, flow_field
+
 
-    return start_time, spawned_enemies, projectile, blast, flow_field
+# Function to schedule one spawn event per enemy, spaced seconds_to_spawn
+# apart starting from now, replacing any spawns still pending
+def schedule_spawns(spawn_scheduler, seconds_to_spawn, num_enemies):
+    spawn_scheduler.clear()
+    for spawn_index in range(num_enemies):
+        spawn_scheduler.schedule("spawn", (spawn_index + 1) * seconds_to_spawn)
 
 
-# Function to determine whether to respawn enemy based on current time
-def determine_spawn(start_time, spawned_enemies, seconds_to_spawn, enemies):
-    # Determine if it's time to spawn a new enemy
-    respawn_time = time.time() - start_time
-    if respawn_time >= (spawned_enemies + 1) * seconds_to_spawn:
-        # Check if there are still enemies to spawn
-        if spawned_enemies < len(enemies):
-            index = spawned_enemies
-            enemy_to_spawn = enemies[index]
-            # Only spawn the enemy if it has not been destroyed
-            if not enemy_to_spawn.is_destroyed():
-                enemy_to_spawn.toggle_spawn()
-            spawned_enemies += 1
-    return spawned_enemies
+# Function to spawn the next waiting enemy for each spawn event which is due.
+# Enemies spawn in list order, and destroyed enemies have already been
+# removed from the list, so a destroyed enemy's spawn passes to the next one.
+def spawn_enemies(spawn_scheduler, enemies):
+    for _ in spawn_scheduler.pop_due():
+        for enemy in enemies:
+            if not enemy.can_spawn() and not enemy.is_destroyed():
+                enemy.toggle_spawn()
+                break
 
 
 # Function to initialize projectile
@@ -55,6 +182,7 @@ def init_projectile(
     sounds,
     pixels_per_second,
     rotate_image,
+    sprite_pool,
 ):
     flags.screen_change = True
     flags.fire_pressed = False
@@ -69,7 +197,7 @@ def init_projectile(
         player_location[1]
         + projectile_direction[1] * int(block_width / (maze_factor * 4)),
     )
-    projectile = Sprite(
+    projectile = sprite_pool.acquire(
         "projectile",
         images["projectile"],
         projectile_location,
@@ -98,11 +226,18 @@ def move_sprites(
     maze_factor,
     flow_field,
     barrier_sprites,
+    sightline_index,
+    enemy_swarm,
+    spatial_hashes,
 ):
     player_move = False
     proj_move = False
     enemy_move = False
 
+    # Sightlines from the previous tick may be stale once sprites move
+    if sightline_index:
+        sightline_index.clear_cache()
+
     if player:
         old_location = player.get_center_position()
         player_move = player.perform_move(maze_grid, game_tick)
@@ -118,17 +253,24 @@ def move_sprites(
                 )
     if projectile:
         proj_move = projectile.perform_move(maze_grid, game_tick)
+    # Advance all enemies together with batched steps if swarm in use
+    if enemy_swarm:
+        enemy_move = enemy_swarm.step(
+            enemies, player, flow_field, barrier_sprites, game_tick
+        )
+        enemies = []
     for enemy in enemies:
         # If collision with barrier sprite, turn enemy around
-        for sprite in barrier_sprites:
+        if spatial_hashes:
+            barriers = spatial_hashes["barriers"].query(enemy.hitbox_rect)
+        else:
+            barriers = [barrier_sprites[sprite] for sprite in barrier_sprites]
+        for barrier in barriers:
             if (
-                barrier_sprites[sprite].collide_check(enemy)
+                barrier.collide_check(enemy)
                 and (enemy.move_dist + enemy.speed * game_tick) >= 1
             ):
-                cur_direction = enemy.get_direction()
-                enemy.set_desired_direction(
-                    -1 * cur_direction[0], -1 * cur_direction[1]
-                )
+                enemy.set_desired_direction(-enemy.direction_x, -enemy.direction_y)
                 if enemy.has_seen_player():
                     enemy.toggle_seen_player()
                 if enemy.is_path_finding():
@@ -137,19 +279,20 @@ def move_sprites(
         # Perform pathfinding if flow field has been computed
         # and if the enemy has seen the player with an unobscured path
         if flow_field and enemy.has_seen_player():
-            enemy_graph_coord = enemy.get_center_position()
-            enemy_graph_coord = tuple(
-                int(element * maze_factor / cfg.SCALE_FACTOR)
-                for element in enemy_graph_coord
+            enemy_graph_coord = (
+                int(enemy.center_x * maze_factor / cfg.SCALE_FACTOR),
+                int(enemy.center_y * maze_factor / cfg.SCALE_FACTOR),
             )
             if enemy_graph_coord in maze_graph_coords:
                 enemy.set_pathfind_direction(flow_field, enemy_graph_coord)
             elif not enemy.is_path_finding():
                 enemy.set_navigate_direction(
-                    player, barrier_sprites, maze_grid, game_tick
+                    player, barrier_sprites, maze_grid, game_tick, sightline_index
                 )
         else:
-            enemy.set_navigate_direction(player, barrier_sprites, maze_grid, game_tick)
+            enemy.set_navigate_direction(
+                player, barrier_sprites, maze_grid, game_tick, sightline_index
+            )
         cur_enemy_move = enemy.perform_move(maze_grid, game_tick)
         if not enemy_move:
             enemy_move = cur_enemy_move
@@ -164,15 +307,13 @@ def move_sprites(
 def move_to_exit(
     player, exit, direction_order, key_order, maze_grid, game_tick, flags, sounds
 ):
-    player_to_exit = (
-        exit.center_position[0] - player.center_position[0],
-        exit.center_position[1] - player.center_position[1],
-    )
+    player_to_exit_x = exit.center_x - player.center_x
+    player_to_exit_y = exit.center_y - player.center_y
     if (
-        (player_to_exit[0] > 0 and player.direction[0] > 0)
-        or (player_to_exit[0] < 0 and player.direction[0] < 0)
-        or (player_to_exit[1] > 0 and player.direction[1] > 0)
-        or (player_to_exit[1] < 0 and player.direction[1] < 0)
+        (player_to_exit_x > 0 and player.direction_x > 0)
+        or (player_to_exit_x < 0 and player.direction_x < 0)
+        or (player_to_exit_y > 0 and player.direction_y > 0)
+        or (player_to_exit_y < 0 and player.direction_y < 0)
     ):
         if direction_order and key_order:
             player.set_desired_direction(direction_order[-1][0], direction_order[-1][1])
@@ -188,14 +329,22 @@ def move_to_exit(
 
 # Function to initialize blast
 def init_blast(
-    projectile, sounds, flags, images, block_width, maze_factor, rotate_image
+    projectile,
+    sounds,
+    flags,
+    images,
+    block_width,
+    maze_factor,
+    rotate_image,
+    sprite_pool,
 ):
     if projectile.is_stopped():
         sounds["proj_hit_wall"].play()
     flags.screen_change = True
     projectile_location = projectile.get_center_position()
+    sprite_pool.release(projectile)
     projectile = []
-    blast = Sprite(
+    blast = sprite_pool.acquire(
         "blast",
         images[cfg.IMAGE_SERIES["blast"][0]],
         projectile_location,
@@ -210,6 +359,19 @@ def init_blast(
     return projectile, blast, flags
 
 
+# Function to get active enemies which may collide with player or projectile,
+# in the same order as the list of active enemies
+def get_collision_candidates(spatial_hashes, player, projectile):
+    rects = [player.hitbox_rect]
+    if projectile:
+        rects.append(projectile.hitbox_rect)
+    return [
+        enemy
+        for enemy in spatial_hashes["enemies"].query(*rects)
+        if enemy.can_spawn() and not enemy.is_destroyed()
+    ]
+
+
 # Function to detect enemy collision with player and projectile
 def check_enemy_collision(
     enemy,
@@ -218,11 +380,8 @@ def check_enemy_collision(
     flags,
     sounds,
     images,
-    spawned_enemies,
-    seconds_to_spawn,
     score,
     lives,
-    start_time,
 ):
     if player.collide_check(enemy):
         lives -= 1
@@ -234,29 +393,43 @@ def check_enemy_collision(
             score += cfg.SCORES[enemy.name]
             enemy.toggle_destroy()
             sounds["proj_hit_enemy"].play()
-            spawned_enemies -= 1
-            start_time += seconds_to_spawn
         else:
             sounds["proj_hit_invincible"].play()
         flags.screen_change = True
         projectile.toggle_destroy()
         enemy.animate(images, cfg.IMAGE_SERIES[enemy.name][1:], cfg.DELAYS[enemy.name])
 
-    return lives, score, spawned_enemies, start_time, flags
+    return lives, score, flags
 
 
 # Function to remove items
-def remove_items(enemies, flags, items, player, score, sounds, barrier_sprites):
+def remove_items(
+    enemy_registry,
+    flags,
+    items,
+    player,
+    score,
+    sounds,
+    barrier_sprites,
+    spatial_hashes,
+    sightline_index,
+):
     # If no more enemies, remove remaining items
     delete_items = []
-    all_destroyed = all(enemy.is_destroyed() for enemy in enemies)
+    all_destroyed = enemy_registry.all_destroyed()
     if all_destroyed:
         flags.screen_change = True
         for item in items:
             delete_items.append(item)
     else:
-        # Detect item collision and delete those items
-        for item in items:
+        # Detect item collision and delete those items, only checking
+        # items sharing a broadphase cell with the player
+        nearby_items = [
+            sprite.name
+            for sprite in spatial_hashes["barriers"].query(player.hitbox_rect)
+            if items.get(sprite.name) is sprite
+        ]
+        for item in nearby_items:
             if player.collide_check(items[item]):
                 flags.screen_change = True
                 score += cfg.SCORES["item"]
@@ -266,8 +439,10 @@ def remove_items(enemies, flags, items, player, score, sounds, barrier_sprites):
 
     # Delete appropriate items
     for item in delete_items:
+        spatial_hashes["barriers"].remove(items[item])
         del items[item]
         del barrier_sprites[item]
+        sightline_index.remove_barrier(item)
 
     return items, flags, score, all_destroyed, barrier_sprites
 
@@ -320,7 +495,8 @@ def animate_exit(flags, exit, images):
     return flags
 
 
-# Function to draw sprites by updating sprite_image_data
+# Function to draw sprites by updating sprite_image_data, in layer order from
+# bottom to top: exit, items, projectile, enemies, blast, player, exit overlay
 def draw_sprites(
     sprite_image_data,
     flags,
@@ -333,60 +509,106 @@ def draw_sprites(
     image_boundary,
     maze_factor,
     pause_delta,
+    native_render,
 ):
-    [
-        sprite_image_data.append(
-            items[item].draw(
-                cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary, maze_factor
-            )
-        )
-        for item in items
-    ]
+    # Sprite positions are in maze pixels, drawn either onto the screen or,
+    # for native rendering, onto the offscreen surface without scaling
+    if native_render:
+        draw_image_x, draw_image_y = 0, 0
+        image_boundary = cfg.IMAGE_BOUNDARY
+        position_scale = maze_factor / cfg.SCALE_FACTOR
+    else:
+        draw_image_x, draw_image_y = cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y
+        position_scale = maze_factor
+
+    # Shift animation start times to account for time spent paused
+    if pause_delta > 0:
+        for enemy in enemies:
+            if enemy.can_spawn() and enemy.animation_start_time:
+                enemy.increment_animation_start_time(pause_delta)
+        if blast and blast.animation_start_time:
+            blast.increment_animation_start_time(pause_delta)
+        pause_delta = 0
+
+    # Advance animations of sprites in draw order, where the exit
+    # animation is advanced separately in the main loop
+    sprites = [items[item] for item in items]
     if projectile:
-        sprite_image_data.append(
-            projectile.draw(
-                cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary, maze_factor
-            )
-        )
-    [
-        enemy.increment_animation_start_time(pause_delta)
-        for enemy in enemies
-        if enemy.can_spawn() and enemy.animation_start_time and pause_delta > 0
-    ]
-    [
-        sprite_image_data.append(
-            enemy.draw(cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary, maze_factor)
-        )
-        for enemy in enemies
-        if enemy.can_spawn()
-    ]
+        sprites.append(projectile)
+    sprites.extend(enemy for enemy in enemies if enemy.can_spawn())
     if blast:
-        if blast.animation_start_time and pause_delta > 0:
-            blast.increment_animation_start_time(pause_delta)
-        sprite_image_data.append(
-            blast.draw(cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary, maze_factor)
-        )
+        sprites.append(blast)
     if player:
-        sprite_image_data.append(
-            player.draw(cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary, maze_factor)
-        )
-
-    # Draw exit again overtop player if door closing
-    if cfg.CLOSE_EXIT_OVERTOP and flags.exit_closing:
-        sprite_image_data.append(
-            exit.draw(cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary, maze_factor)
-        )
+        sprites.append(player)
+    for sprite in sprites:
+        sprite.update_animation()
+    if exit:
+        sprites.insert(0, exit)
+
+    # Only produce draw data if a sprite moved, spawned, or changed
+    # animation frame, or if the screen is being redrawn anyway
+    if flags.screen_change or any(sprite.dirty for sprite in sprites):
+        flags.screen_change = True
+        for sprite in sprites:
+            sprite_image_data.append(
+                sprite.draw(draw_image_x, draw_image_y, image_boundary, position_scale)
+            )
 
-    # Reset pause delta
-    if pause_delta > 0:
-        pause_delta = 0
+        # Draw exit again overtop player if door closing
+        if cfg.CLOSE_EXIT_OVERTOP and flags.exit_closing:
+            sprite_image_data.append(
+                exit.draw(draw_image_x, draw_image_y, image_boundary, position_scale)
+            )
 
     return sprite_image_data, pause_delta
 
 
+# Function to set up offscreen rendering at native maze resolution, holding
+# a downscaled copy of the drawn maze and the screen area it is upscaled to
+def init_native_render(screen, area_surf, maze_width, maze_height, image_boundary):
+    maze_rect = pygame.Rect(
+        cfg.DRAW_IMAGE_X,
+        cfg.DRAW_IMAGE_Y,
+        maze_width + 2 * image_boundary,
+        maze_height + 2 * image_boundary,
+    )
+    native_size = (
+        maze_rect.width // cfg.SCALE_FACTOR,
+        maze_rect.height // cfg.SCALE_FACTOR,
+    )
+    native_render = {}
+    native_render["background"] = pygame.transform.scale(
+        area_surf.subsurface(maze_rect), native_size
+    )
+    native_render["target"] = pygame.Surface(native_size)
+    native_render["screen_area"] = screen.subsurface(maze_rect)
+    return native_render
+
+
+# Function to blit sprites onto the screen, or for native rendering onto the
+# offscreen maze, which is then upscaled onto the screen in a single step
+def blit_sprites(screen, sprite_image_data, native_render):
+    if native_render:
+        target = native_render["target"]
+        target.blit(native_render["background"], (0, 0))
+        target.blits(sprite_image_data, doreturn=False)
+        screen_area = native_render["screen_area"]
+        pygame.transform.scale(target, screen_area.get_size(), screen_area)
+    else:
+        screen.blits(sprite_image_data, doreturn=False)
+
+
 # Function to update screen
 def screen_update(
-    screen, area_surf, fonts, score, lives, controls_option, sprite_image_data, flags
+    screen,
+    area_surf,
+    fonts,
+    score,
+    lives,
+    controls_option,
+    sprite_image_data,
+    flags,
+    native_render,
 ):
     # Clear screen and re-draw background
     screen.fill(cfg.COLORS["black"])
@@ -415,9 +637,8 @@ def screen_update(
     locs = cfg.TEXT_LOC["lives_value"]
     screen.blit(text_surface, (locs[0], locs[1]))
 
-    # Print sprites
-    for item in sprite_image_data:
-        screen.blit(item[0], item[1])
+    # Print sprites in one call, in the layer order given by draw_sprites
+    blit_sprites(screen, sprite_image_data, native_render)
 
     pygame.display.flip()
     flags.screen_change = False
@@ -438,17 +659,33 @@ def check_game_tick(game_time, game_tick):
 
 
 # Function to introduce pause after player collision with enemy
-def player_collide_pause(lives, sounds, game_time):
+def player_collide_pause(lives, sounds, scheduler):
     if lives >= 0:
         sounds["player_hit"].play()
-    time.sleep(cfg.PAUSES["player_hit_enemy"])
-    # Update game clock at end of delay
-    game_time.tick()
+    scheduler.schedule_pause("player_hit_enemy", cfg.PAUSES["player_hit_enemy"])
+
+
+# Function to handle timed events once they are due
+def handle_timed_events(scheduler, flags, level_index, levels, game_time):
+    for event_name in scheduler.pop_due():
+        if event_name == "player_hit_enemy":
+            # Update game clock at end of delay
+            game_time.tick()
+        elif event_name == "door_closed":
+            flags, level_index = exit_level(level_index, levels, flags)
+
+    return flags, level_index
+
 
+# Function to get the index of the level following the current one
+def get_next_level_index(level_index, levels):
+    if level_index >= len(levels) - 1:
+        return 0
+    return level_index + 1
 
-# Function to exit to the next level
+
+# Function to exit to the next level, once the closed door has been shown
 def exit_level(level_index, levels, flags):
-    time.sleep(cfg.PAUSES["door_closed"])
     if level_index >= len(levels) - 1:
         level_index = 0
         flags.reached_last_level = True
@@ -460,18 +697,22 @@ def exit_level(level_index, levels, flags):
 
 
 # Function to end the game
-def end_game(flags, fonts, screen, sounds):
+def end_game(flags, fonts, screen, sounds, scheduler):
     for row, text_line in enumerate(cfg.ENDGAME_STRINGS):
         text_surface = fonts["normal"].render(text_line, True, cfg.COLORS["yellow"])
         locs = cfg.TEXT_LOC["endgame"]
         screen.blit(text_surface, (locs[0], locs[1] + row * locs[2]))
     flags.game_intro = True
+    flags.paused = False
     level_index = 0
     score = 0
     lives = cfg.LIVES_DEFAULT
     sounds["endgame"].play()
     pygame.display.flip()
-    time.sleep(cfg.PAUSES["endgame"])
+
+    # Cancel pauses of the level, so none can move on to another level
+    scheduler.clear()
+    scheduler.schedule_pause("endgame", cfg.PAUSES["endgame"])
 
     return flags, level_index, score, lives
 
@@ -1,12 +1,12 @@
 import os
 import ast
 import pygame
-import time
 from collections import deque
 from utils.exceptions import CustomError
 from settings import config as cfg
 from fileio.load import (
-    import_image_dir,
+    import_image_atlas,
+    import_scaled_image_dir,
     import_sound_dir,
     get_levels,
     read_csv_dict,
@@ -53,7 +53,6 @@ def game_init():
     score = 0
     lives = cfg.LIVES_DEFAULT
     game_time = pygame.time.Clock()
-    start_time = time.time()
     pause_start = []
 
     return (
@@ -68,7 +67,6 @@ def game_init():
         score,
         lives,
         game_time,
-        start_time,
         pause_start,
     )
 
@@ -94,29 +92,50 @@ def load_settings():
     for index, opt in enumerate(cfg.MAZE_FIDELITY_OPTS):
         if maze_fidelity == opt:
             maze_fidelity_index = index
-            maze_factor = cfg.MAZE_FIDELITY_FACTORS[index]
+            maze_factor = get_maze_factor(index, settings[0])
     if maze_fidelity_index == None or maze_factor == None:
         raise CustomError(cfg.ERROR_STRINGS["maze_fidelity"])
 
     return maze_fidelity, maze_fidelity_index, maze_factor, controls_option
 
 
+# Function to get the maze factor of a fidelity option, where the auto
+# option uses the fidelity it last chose, or the finest if none yet
+def get_maze_factor(maze_fidelity_index, settings):
+    maze_factor = cfg.MAZE_FIDELITY_FACTORS[maze_fidelity_index]
+    if maze_factor is None:
+        auto_fidelity = settings.get("auto_fidelity")
+        if auto_fidelity in cfg.MAZE_FIDELITY_OPTS:
+            maze_factor = cfg.MAZE_FIDELITY_FACTORS[
+                cfg.MAZE_FIDELITY_OPTS.index(auto_fidelity)
+            ]
+        if maze_factor is None:
+            maze_factor = min(
+                factor for factor in cfg.MAZE_FIDELITY_FACTORS if factor is not None
+            )
+    return maze_factor
+
+
 # Function to load images, sounds, and levels
 def load_resources():
-    # Load enemy images and scale them
-    images = import_image_dir(cfg.DIRS["images"])
-    for image in images:
-        images[image] = pygame.transform.scale(
-            images[image],
-            (
-                int(images[image].get_width() * cfg.SCALE_FACTOR),
-                int(images[image].get_height() * cfg.SCALE_FACTOR),
-            ),
+    # Load enemy images and scale them, unless drawn at native resolution
+    scale_factor = 1 if cfg.NATIVE_RENDER else cfg.SCALE_FACTOR
+    images = import_image_atlas(
+        cfg.DIRS["images"],
+        cfg.DIRS["atlas"] + cfg.FILES["atlas_image"],
+        cfg.DIRS["atlas"] + cfg.FILES["atlas_index"],
+        scale_factor,
+        cfg.DIRS["cache"],
+    )
+    if not images:
+        images = import_scaled_image_dir(
+            cfg.DIRS["images"], scale_factor, cfg.DIRS["cache"]
         )
+    for image in images:
         # Make teal the transparent color
         images[image].set_colorkey(cfg.COLORS["replace_teal"])
 
-    # Get sound effects
+    # Get sound effects, which load on first play
     sounds = import_sound_dir(cfg.DIRS["sounds"])
 
     # Get levels and their supporting file paths
@@ -0,0 +1,180 @@
+import ast
+import time
+from settings import config as cfg
+from fileio.load import read_csv_dict, read_csv_path
+from rect.utils import define_rect
+from path.utils import rect_within_boundary, grid_gives_uniform_path
+from path.pathfind import create_graph, create_flow_field
+from game.level import create_grid
+
+
+# Function to validate the files of one level without drawing it, returning
+# the level folder, a list of problems found, and the seconds taken
+def validate_level(level):
+    start_time = time.perf_counter()
+    maze_assets = read_csv_dict(level.get("assets"))
+    maze_metadata = read_csv_dict(level.get("metadata"))
+    maze_path = read_csv_path(level.get("path"))
+
+    errors = []
+    if not maze_path:
+        errors.append("path coordinates missing")
+    else:
+        errors += check_path(maze_path)
+    asset_coord, asset_errors = check_assets(maze_assets)
+    errors += asset_errors
+    if maze_path and asset_coord and not errors:
+        errors += check_reachability(maze_path, asset_coord)
+    if not maze_metadata:
+        errors.append("metadata missing")
+    else:
+        errors += check_metadata(maze_metadata[0])
+    if level.get("sprite_colors"):
+        errors += check_sprite_colors(read_csv_dict(level.get("sprite_colors")))
+
+    return level.get("folder"), errors, time.perf_counter() - start_time
+
+
+# Function to check path blocks are within the maze and give a uniform path,
+# using the rules enforced by the level builder
+def check_path(maze_path):
+    coords_scaled = [
+        (int(x / cfg.SCALE_FACTOR), int(y / cfg.SCALE_FACTOR)) for x, y in maze_path
+    ]
+    outside_coords = [
+        coord
+        for coord in coords_scaled
+        if not rect_within_boundary(
+            define_rect(coord, cfg.BLOCK_WIDTH),
+            0,
+            0,
+            0,
+            cfg.MAZE_WIDTH,
+            cfg.MAZE_HEIGHT,
+        )
+    ]
+    if outside_coords:
+        return [f"{len(outside_coords)} path blocks outside maze"]
+
+    maze_grid = create_grid(
+        cfg.MAZE_WIDTH * cfg.SCALE_FACTOR,
+        cfg.MAZE_HEIGHT * cfg.SCALE_FACTOR,
+        cfg.BLOCK_WIDTH * cfg.SCALE_FACTOR,
+        cfg.SCALE_FACTOR,
+        maze_path,
+    )
+    if not grid_gives_uniform_path(
+        maze_grid, cfg.MAZE_WIDTH, cfg.MAZE_HEIGHT, cfg.BLOCK_WIDTH
+    ):
+        return ["path is not a uniform width"]
+    return []
+
+
+# Function to check each allowable asset letter is assigned one location,
+# returning the asset coordinates and any problems found
+def check_assets(maze_assets):
+    asset_coord = {}
+    errors = []
+    seen_letters = set()
+    for asset in maze_assets:
+        letter = asset.get("letter")
+        if letter not in cfg.ALLOWABLE_LETTERS:
+            errors.append(f"asset letter {letter} not allowed")
+            continue
+        if letter in seen_letters:
+            errors.append(f"asset {letter} placed more than once")
+            continue
+        seen_letters.add(letter)
+        try:
+            location = ast.literal_eval(asset.get("location") or "()")
+        except (ValueError, SyntaxError):
+            location = ()
+        if not isinstance(location, tuple) or len(location) != 2:
+            errors.append(f"asset {letter} has no location")
+        else:
+            asset_coord[letter] = location
+
+    missing_letters = [
+        letter for letter in cfg.ALLOWABLE_LETTERS if letter not in seen_letters
+    ]
+    if missing_letters:
+        errors.append(f"assets missing: {', '.join(missing_letters)}")
+    return asset_coord, errors
+
+
+# Function to check every asset can be reached from the player start, using
+# the graph of path coordinates the game builds for enemy pathfinding
+def check_reachability(maze_path, asset_coord):
+    graph, scaled_coords = create_graph(maze_path, cfg.SCALE_FACTOR, cfg.BLOCK_WIDTH)
+
+    # Match each asset to the path coordinates whose block it lies within
+    half_width = cfg.BLOCK_WIDTH / 2
+    asset_points = {}
+    for letter, location in asset_coord.items():
+        x = int(location[0] / cfg.SCALE_FACTOR)
+        y = int(location[1] / cfg.SCALE_FACTOR)
+        asset_points[letter] = [
+            point
+            for point in graph
+            if abs(point[0] - x) < half_width and abs(point[1] - y) < half_width
+        ]
+
+    errors = [
+        f"asset {letter} not on path"
+        for letter in asset_points
+        if not asset_points[letter]
+    ]
+    if errors:
+        return errors
+
+    flow_field = create_flow_field(graph, scaled_coords, asset_points["S"][0])
+    for letter, points in asset_points.items():
+        if all(flow_field[point] is None for point in points):
+            errors.append(f"asset {letter} not reachable from start")
+    return errors
+
+
+# Function to check level metadata values are within the ranges the level
+# builder offers
+def check_metadata(maze_metadata):
+    errors = []
+    if maze_metadata.get("level_speed") not in cfg.LEVEL_SPEED_ORDER:
+        errors.append(f"level speed {maze_metadata.get('level_speed')} not valid")
+
+    try:
+        maze_color = ast.literal_eval(maze_metadata.get("maze_color") or "")
+    except (ValueError, SyntaxError):
+        maze_color = None
+    if (
+        not isinstance(maze_color, tuple)
+        or len(maze_color) != 3
+        or any(
+            not isinstance(value, int) or not 0 <= value <= 255 for value in maze_color
+        )
+    ):
+        errors.append(f"maze color {maze_metadata.get('maze_color')} not valid")
+
+    max_quantity = {
+        "corn_quantity": cfg.MAX_CORN,
+        "tomato_quantity": cfg.MAX_TOMATO,
+        "pumpkin_quantity": cfg.MAX_PUMPKIN,
+    }
+    for key, max_value in max_quantity.items():
+        try:
+            quantity = ast.literal_eval(maze_metadata.get(key) or "")
+        except (ValueError, SyntaxError):
+            quantity = None
+        if not isinstance(quantity, int) or not 0 <= quantity <= max_value:
+            errors.append(f"{key} {maze_metadata.get(key)} not within 0 to {max_value}")
+    return errors
+
+
+# Function to check the optional sprite colors of a level are known colors
+def check_sprite_colors(sprite_colors):
+    if not sprite_colors:
+        return ["sprite colors empty"]
+    errors = []
+    for key in ["first_color", "second_color"]:
+        if sprite_colors[0].get(key) not in cfg.COLORS:
+            errors.append(f"sprite {key} {sprite_colors[0].get(key)} not valid")
+    return errors
@@ -0,0 +1,69 @@
+# Class to keep a maze grid (1s walls, 0s path) up to date as path blocks are
+# added and removed in the level builder, so each change only touches the
+# cells of one block. A count of blocks covering each cell decides when a
+# cell turns back into wall.
+class OccupancyGrid:
+    def __init__(self, maze_width, maze_height, block_width):
+        self.maze_width = maze_width
+        self.maze_height = maze_height
+        self.block_width = block_width
+        self.maze_grid = [[1] * maze_width for _ in range(maze_height)]
+        self.coverage = [[0] * maze_width for _ in range(maze_height)]
+        self.centers = {}
+
+    # Method to clear the grid and add a block at each center
+    def reset(self, centers):
+        for row in range(self.maze_height):
+            self.maze_grid[row][:] = [1] * self.maze_width
+            self.coverage[row][:] = [0] * self.maze_width
+        self.centers.clear()
+        for center in centers:
+            self.add_block(center)
+
+    # Method to get the cell ranges covered by a block, matching the cells
+    # marked by invert_maze_to_grid
+    def get_block_range(self, center):
+        half_width = int(self.block_width / 2)
+        row_min = max(0, center[1] - half_width)
+        row_max = min(self.maze_height, center[1] + half_width)
+        col_min = max(0, center[0] - half_width)
+        col_max = min(self.maze_width, center[0] + half_width)
+        return range(row_min, row_max), range(col_min, col_max)
+
+    # Method to add a path block
+    def add_block(self, center):
+        self.centers[center] = self.centers.get(center, 0) + 1
+        rows, cols = self.get_block_range(center)
+        for row in rows:
+            grid_row = self.maze_grid[row]
+            coverage_row = self.coverage[row]
+            for col in cols:
+                coverage_row[col] += 1
+                grid_row[col] = 0
+
+    # Method to remove a path block
+    def remove_block(self, center):
+        if self.centers[center] == 1:
+            del self.centers[center]
+        else:
+            self.centers[center] -= 1
+        rows, cols = self.get_block_range(center)
+        for row in rows:
+            grid_row = self.maze_grid[row]
+            coverage_row = self.coverage[row]
+            for col in cols:
+                coverage_row[col] -= 1
+                if not coverage_row[col]:
+                    grid_row[col] = 1
+
+    # Method to get centers of blocks which collide with or are tangent to a
+    # block at the given center, by looking up each nearby center
+    def get_tangent_centers(self, center):
+        tangent_centers = []
+        for y in range(center[1] - self.block_width, center[1] + self.block_width + 1):
+            for x in range(
+                center[0] - self.block_width, center[0] + self.block_width + 1
+            ):
+                if (x, y) in self.centers:
+                    tangent_centers.append((x, y))
+        return tangent_centers
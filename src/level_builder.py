@@ -1,6 +1,6 @@
 import pygame
 from settings import config as cfg
-from rect.draw import draw_maze
+from rect.draw import draw_maze, update_dirty_rects
 from builder.start import (
     builder_init,
     Flags,
@@ -10,7 +10,9 @@ from builder.start import (
     draw_speed_enemy_text,
 )
 from builder.input import process_input
-from builder.draw import draw_path, undo_path_rect, erase_path, undo_asset_placement
+from builder.action import recover_autosaved_maze, show_export_progress
+from builder.draw import draw_path, erase_path
+from builder.history import PATH_EDITS, ASSET_EDITS, undo_edit, redo_edit
 
 # Initialize level builder
 (
@@ -29,9 +31,13 @@ from builder.draw import draw_path, undo_path_rect, erase_path, undo_asset_place
     dirty_rects,
     chosen_coords,
     shifted_coords_history,
+    occupancy_grid,
     asset_coords,
     asset_letters,
     asset_defs,
+    edit_log,
+    autosave_journal,
+    level_exporter,
 ) = builder_init()
 
 
@@ -90,6 +96,21 @@ draw_speed_enemy_text(
     enemy_index["pumpkin"],
 )
 
+# Offer to recover the maze of a previous session, then autosave from here
+chosen_coords, shifted_coords_history, maze_color_index = recover_autosaved_maze(
+    image_boundary,
+    maze_width,
+    maze_height,
+    block_width,
+    maze_colors,
+    maze_color_index,
+    screen,
+    chosen_coords,
+    shifted_coords_history,
+    occupancy_grid,
+)
+autosave_journal.write_snapshot(chosen_coords, maze_color_index)
+
 # Builder loop flags
 flags = Flags()
 
@@ -127,6 +148,9 @@ while flags.running:
             asset_letters,
             asset_defs,
             shifted_coords_history,
+            occupancy_grid,
+            edit_log,
+            level_exporter,
         )
 
     if flags.maze_draw:
@@ -153,20 +177,51 @@ while flags.running:
             screen,
             dirty_rects,
             shifted_coords_history,
+            occupancy_grid,
+            edit_log,
             arrow_index,
         )
-    # Undo last path draw
-    elif flags.x_pressed and len(chosen_coords) > 0 and flags.maze_draw:
-        flags = undo_path_rect(
+    # Undo last path draw, erase or wall color change
+    elif flags.x_pressed and edit_log.can_undo(PATH_EDITS) and flags.maze_draw:
+        maze_color_index = undo_edit(
+            edit_log,
             chosen_coords,
             shifted_coords_history,
-            block_width,
+            occupancy_grid,
+            asset_coords,
             maze_colors,
             maze_color_index,
+            maze_width,
+            maze_height,
+            block_width,
+            image_boundary,
             screen,
             dirty_rects,
+            fonts,
             flags,
         )
+        flags.x_pressed = False
+    # Redo last undone edit of the current mode
+    elif flags.y_pressed:
+        if edit_log.can_redo(PATH_EDITS if flags.maze_draw else ASSET_EDITS):
+            maze_color_index = redo_edit(
+                edit_log,
+                chosen_coords,
+                shifted_coords_history,
+                occupancy_grid,
+                asset_coords,
+                maze_colors,
+                maze_color_index,
+                maze_width,
+                maze_height,
+                block_width,
+                image_boundary,
+                screen,
+                dirty_rects,
+                fonts,
+                flags,
+            )
+        flags.y_pressed = False
     # Erase path at mouse location
     elif flags.mouse_right_held and len(chosen_coords) > 0 and flags.maze_draw:
         if not flags.draw_dots:
@@ -203,17 +258,50 @@ while flags.running:
             image_boundary,
             shifted_coords_history,
             chosen_coords,
+            occupancy_grid,
+            edit_log,
             maze_colors,
             maze_color_index,
             screen,
             dirty_rects,
         )
     # Undo last asset drawing
-    elif flags.mouse_right_click and len(asset_coords) > 0 and not flags.maze_draw:
-        flags = undo_asset_placement(
-            asset_coords, asset_defs, block_width, screen, dirty_rects, flags
+    elif (
+        flags.mouse_right_click
+        and edit_log.can_undo(ASSET_EDITS)
+        and not flags.maze_draw
+    ):
+        maze_color_index = undo_edit(
+            edit_log,
+            chosen_coords,
+            shifted_coords_history,
+            occupancy_grid,
+            asset_coords,
+            maze_colors,
+            maze_color_index,
+            maze_width,
+            maze_height,
+            block_width,
+            image_boundary,
+            screen,
+            dirty_rects,
+            fonts,
+            flags,
         )
+        flags.mouse_right_click = False
+
+    # Show progress of level files being exported
+    show_export_progress(level_exporter, screen, dirty_rects, fonts)
+
+    # Update the screen once for everything drawn this frame
+    update_dirty_rects(dirty_rects)
+
+    # Snapshot maze for autosave when enough edits are journaled
+    if autosave_journal.snapshot_due():
+        autosave_journal.write_snapshot(chosen_coords, maze_color_index)
 
 
 # Quit
+autosave_journal.close()
+level_exporter.close()
 pygame.quit()
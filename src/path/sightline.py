@@ -0,0 +1,174 @@
+import bisect
+
+
+# Class to index the maximal straight free segments of a maze grid, so that
+# sightline checks between two sprites become lookups instead of scans.
+# Horizontal bands are keyed by (top row, band height) and vertical bands by
+# (left column, band width). A band is built on first use, then reused for
+# the rest of the level. Barrier sprites are indexed the same way, as the
+# extents they block along each band, which are rebuilt once a barrier is
+# added or removed.
+class SightlineIndex:
+    def __init__(self, maze_grid):
+        self.maze_grid = maze_grid
+        self.grid_height = len(maze_grid)
+        self.grid_width = len(maze_grid[0])
+        self.row_bands = {}
+        self.col_bands = {}
+
+        # Barrier sprites by name, and their merged extents for each band
+        self.barriers = {}
+        self.row_barriers = {}
+        self.col_barriers = {}
+
+        # Sightline results for the current game tick, keyed by
+        # (enemy position, player position, enemy path width)
+        self.sight_cache = {}
+
+    # Method to get start and end of free segments for a horizontal band,
+    # where a column is free if all rows of the band are path (0s)
+    def get_row_band(self, top, height):
+        key = (top, height)
+        if key not in self.row_bands:
+            band_rows = self.maze_grid[top : top + height]
+            free_cells = [not any(column) for column in zip(*band_rows)]
+            self.row_bands[key] = SightlineIndex.segment_bounds(free_cells)
+        return self.row_bands[key]
+
+    # Method to get start and end of free segments for a vertical band,
+    # where a row is free if all columns of the band are path (0s)
+    def get_col_band(self, left, width):
+        key = (left, width)
+        if key not in self.col_bands:
+            free_cells = [not any(row[left : left + width]) for row in self.maze_grid]
+            self.col_bands[key] = SightlineIndex.segment_bounds(free_cells)
+        return self.col_bands[key]
+
+    # Method to determine the start and end index of the free segment
+    # containing each cell, or -1 for cells which are not free
+    @staticmethod
+    def segment_bounds(free_cells):
+        num_cells = len(free_cells)
+        starts = [-1] * num_cells
+        ends = [-1] * num_cells
+        start = -1
+        for index, is_free in enumerate(free_cells):
+            if not is_free:
+                start = -1
+            else:
+                if start < 0:
+                    start = index
+                starts[index] = start
+        end = -1
+        for index in range(num_cells - 1, -1, -1):
+            if not free_cells[index]:
+                end = -1
+            else:
+                if end < 0:
+                    end = index
+                ends[index] = end
+        return starts, ends
+
+    # Method to check if a rect spanning a sightline is within the path,
+    # giving the same result as Sprite.is_path_clear for that rect.
+    # The rect spans columns if moving horizontally, otherwise rows.
+    def is_span_clear(self, temp_rect, move_direction):
+        left, top, width, height = temp_rect
+        # Check if within bounds of maze
+        if (
+            left < 0
+            or left + width > self.grid_width
+            or top < 0
+            or top + height > self.grid_height
+        ):
+            return False
+        if width == 0 or height == 0:
+            return True
+        # Both ends of the span must lie within the same free segment
+        if move_direction[0] != 0:
+            _, ends = self.get_row_band(top, height)
+            return ends[left] >= left + width - 1
+        _, ends = self.get_col_band(left, width)
+        return ends[top] >= top + height - 1
+
+    # Method to add a barrier sprite which blocks sightlines
+    def add_barrier(self, name, sprite):
+        self.barriers[name] = sprite
+        self.row_barriers.clear()
+        self.col_barriers.clear()
+
+    # Method to remove a barrier sprite, such as an item which was collected
+    def remove_barrier(self, name):
+        if self.barriers.pop(name, None):
+            self.row_barriers.clear()
+            self.col_barriers.clear()
+
+    # Method to get start and end of the extents blocked by barriers for a
+    # horizontal band, as columns overlapped by barriers within the band
+    def get_row_barriers(self, top, height):
+        key = (top, height)
+        if key not in self.row_barriers:
+            extents = [
+                (rect.left, rect.right)
+                for rect in self.get_barrier_rects()
+                if rect.top < top + height and rect.bottom > top
+            ]
+            self.row_barriers[key] = SightlineIndex.merge_extents(extents)
+        return self.row_barriers[key]
+
+    # Method to get start and end of the extents blocked by barriers for a
+    # vertical band, as rows overlapped by barriers within the band
+    def get_col_barriers(self, left, width):
+        key = (left, width)
+        if key not in self.col_barriers:
+            extents = [
+                (rect.top, rect.bottom)
+                for rect in self.get_barrier_rects()
+                if rect.left < left + width and rect.right > left
+            ]
+            self.col_barriers[key] = SightlineIndex.merge_extents(extents)
+        return self.col_barriers[key]
+
+    # Method to get the hitbox rects of barriers, ignoring empty rects which
+    # never collide
+    def get_barrier_rects(self):
+        return [
+            sprite.hitbox_rect
+            for sprite in self.barriers.values()
+            if sprite.hitbox_rect.width and sprite.hitbox_rect.height
+        ]
+
+    # Method to merge overlapping or touching extents, returning the sorted
+    # starts and ends of the disjoint extents which remain
+    @staticmethod
+    def merge_extents(extents):
+        starts = []
+        ends = []
+        for start, end in sorted(extents):
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    # Method to check if a rect spanning a sightline overlaps a barrier,
+    # giving the same result as checking colliderect against each barrier.
+    # The rect spans columns if moving horizontally, otherwise rows.
+    def is_span_blocked(self, temp_rect, move_direction):
+        left, top, width, height = temp_rect
+        if width == 0 or height == 0:
+            return False
+        if move_direction[0] != 0:
+            starts, ends = self.get_row_barriers(top, height)
+            span_start, span_end = left, left + width
+        else:
+            starts, ends = self.get_col_barriers(left, width)
+            span_start, span_end = top, top + height
+        # Only the last extent starting before the span ends can overlap it
+        index = bisect.bisect_left(starts, span_end) - 1
+        return index >= 0 and ends[index] > span_start
+
+    # Method to clear cached sightline results at the start of a game tick
+    def clear_cache(self):
+        self.sight_cache.clear()
@@ -1,4 +1,5 @@
 import pygame
+import numpy as np
 from grid.utils import invert_maze_to_grid
 
 
@@ -38,118 +39,105 @@ def rect_within_boundary(
 # Function to check path diagonal width
 # Only need to check edges, not corners
 def edge_diagonals_legal(subset_grid, maze_width, maze_height, block_width):
-    for row in range(maze_height):
-        for col in range(maze_width):
-            # Diagonal must be equal to least block_width
-            # (since grid, no need for square root)
-            # Lower left edge
-            #    /
-            # 0,0
-            # 1,0
-            if is_edge(subset_grid, row, col, maze_width, maze_height, (-1, 1)):
-                if not diag_direction_legal(
-                    subset_grid, row, col, maze_width, maze_height, block_width, (1, -1)
-                ):
-                    return False
-
-            # Upper left edge
-            # 1,0
-            # 0,0
-            #    \
-            elif is_edge(subset_grid, row, col, maze_width, maze_height, (-1, -1)):
-                if not diag_direction_legal(
-                    subset_grid, row, col, maze_width, maze_height, block_width, (1, 1)
-                ):
-                    return False
-
-            # Lower right edge
-            # \
-            #  0,0
-            #  0,1
-            elif is_edge(subset_grid, row, col, maze_width, maze_height, (1, 1)):
-                if not diag_direction_legal(
-                    subset_grid,
-                    row,
-                    col,
-                    maze_width,
-                    maze_height,
-                    block_width,
-                    (-1, -1),
-                ):
-                    return False
-
-            # Upper right edge
-            #  0,1
-            #  0,0
-            # /
-            elif is_edge(subset_grid, row, col, maze_width, maze_height, (1, -1)):
-                if not diag_direction_legal(
-                    subset_grid, row, col, maze_width, maze_height, block_width, (-1, 1)
-                ):
-                    return False
-    return True
+    return edge_diagonals_within_legal(
+        subset_grid,
+        maze_width,
+        maze_height,
+        block_width,
+        range(maze_height),
+        range(maze_width),
+    )
 
 
-# Helper function for edge_diagonals_legal to check if diagonal path starting from an edge is legal
-# diag_direction is (x, y) where +x is right and +y is down
-def diag_direction_legal(
-    subset_grid, row, col, maze_width, maze_height, block_width, diag_direction
+# Function to check path diagonal width for edges within the given rows and
+# columns, with diagonals free to extend beyond them. An edge is the first 0
+# along a diagonal, starting from a wall forming a convex 90 degree turn.
+# From each edge, the diagonal path pointing away from the wall must be at
+# least block_width long (since grid, no need for square root).
+def edge_diagonals_within_legal(
+    subset_grid, maze_width, maze_height, block_width, rows, cols
 ):
-    diag_width = 1
-    found_boundary = False
-    found_wall = False
-    while not found_wall and not found_boundary:
-        if (
-            row + diag_width * diag_direction[1] < 0
-            or col + diag_width * diag_direction[0] < 0
-            or row + diag_width * diag_direction[1] == maze_height
-            or col + diag_width * diag_direction[0] == maze_width
-        ):
-            found_boundary = True
-        elif (
-            subset_grid[row + diag_width * diag_direction[1]][
-                col + diag_width * diag_direction[0]
-            ]
-            == 0
-        ):
-            diag_width += 1
-        else:
-            found_wall = True
-    if diag_width < block_width:
-        # Found instance of non-compliant diagonal
-        return False
-    elif diag_width > block_width and not found_boundary:
-        # If opposing edge
-        if is_edge(
-            subset_grid,
-            row + diag_width * diag_direction[1],
-            col + diag_width * diag_direction[0],
-            maze_width,
-            maze_height,
-            diag_direction,
-        ):
+    if not rows or not cols:
+        return True
+
+    # Only a block width beyond the checked edges can affect the result
+    row_min = max(0, rows.start - block_width)
+    row_max = min(maze_height, rows.stop + block_width)
+    col_min = max(0, cols.start - block_width)
+    col_max = min(maze_width, cols.stop + block_width)
+    grid = np.array([row[col_min:col_max] for row in subset_grid[row_min:row_max]])
+    path = grid == 0
+    wall = grid == 1
+
+    # Edges must be on checked cells away from the maze boundary
+    row_index = np.arange(row_min, row_max)[:, np.newaxis]
+    col_index = np.arange(col_min, col_max)[np.newaxis, :]
+    checked = (
+        (row_index >= max(rows.start, 1))
+        & (row_index < min(rows.stop, maze_height - 1))
+        & (col_index >= max(cols.start, 1))
+        & (col_index < min(cols.stop, maze_width - 1))
+        & path
+    )
+
+    # Each edge is only checked for the first of these directions it matches,
+    # given as (x, y) pointing towards the wall, where +x is right, +y is down
+    # Lower left edge, upper left edge, lower right edge, upper right edge
+    #    /       1,0     \         0,1
+    # 0,0        0,0      0,0      0,0
+    # 1,0           \     0,1     /
+    for diag_direction in [(-1, 1), (-1, -1), (1, 1), (1, -1)]:
+        x, y = diag_direction
+        edges = (
+            checked
+            & shift_grid(path, 0, x)
+            & shift_grid(path, y, 0)
+            & shift_grid(wall, y, x)
+        )
+        checked &= ~edges
+
+        # Diagonal width counts the edge and the path cells beyond it, up to
+        # a wall or the maze boundary
+        path_run = diagonal_path_run(path, (-x, -y))
+        if np.any(edges & (shift_grid(path_run, -y, -x) + 1 < block_width)):
             # Found instance of non-compliant diagonal
             return False
     return True
 
 
-# Helper function for diag_direction_legal to check if row, col
-# is the first 0 along a diagonal, starting from a wall edge
-# (where wall forms a convex 90 degree turn)
-# The diag direction points towards the wall edge
-def is_edge(subset_grid, row, col, maze_width, maze_height, diag_direction):
-    if (
-        subset_grid[row][col] == 0
-        and row < maze_height - 1
-        and row > 0
-        and col < maze_width - 1
-        and col > 0
-        and subset_grid[row][col + diag_direction[0]] == 0
-        and subset_grid[row + diag_direction[1]][col] == 0
-        and subset_grid[row + diag_direction[1]][col + diag_direction[0]] == 1
-    ):
-        return True
-    return False
+# Helper function for edge_diagonals_within_legal to shift a grid so each cell
+# holds the value of the cell offset by (row_offset, col_offset), with cells
+# offset beyond the grid set to 0
+def shift_grid(grid, row_offset, col_offset):
+    shifted = np.zeros_like(grid)
+    rows, cols = grid.shape
+    shifted[
+        max(0, -row_offset) : rows - max(0, row_offset),
+        max(0, -col_offset) : cols - max(0, col_offset),
+    ] = grid[
+        max(0, row_offset) : rows - max(0, -row_offset),
+        max(0, col_offset) : cols - max(0, -col_offset),
+    ]
+    return shifted
+
+
+# Helper function for edge_diagonals_within_legal to count, for each cell, the
+# consecutive path cells starting there along a diagonal direction (x, y),
+# scanning rows from the far end of the diagonal
+def diagonal_path_run(path, diag_direction):
+    x, y = diag_direction
+    path_run = np.zeros(path.shape, dtype=int)
+    row_order = range(path.shape[0] - 1, -1, -1) if y > 0 else range(path.shape[0])
+    previous_row = np.zeros(path.shape[1], dtype=int)
+    for row in row_order:
+        next_run = np.zeros_like(previous_row)
+        if x > 0:
+            next_run[:-1] = previous_row[1:]
+        else:
+            next_run[1:] = previous_row[:-1]
+        path_run[row] = np.where(path[row], next_run + 1, 0)
+        previous_row = path_run[row]
+    return path_run
 
 
 # Function to check if path width larger than necessary
@@ -158,27 +146,22 @@ def overlayed_squares_legal(subset_grid, block_width):
     if not subset_grid or not subset_grid[0]:
         return False
 
-    rows, cols = len(subset_grid), len(subset_grid[0])
-
-    # dp[i][j] stores the side length of the largest square of 0s
-    # with its bottom-right corner at (i, j).
-    dp = [[0] * cols for _ in range(rows)]
-
-    # Iterate through the grid to fill the dp table
-    for i in range(rows):
-        for j in range(cols):
-            if subset_grid[i][j] == 0:
-                # For the first row and column, the side length is 1
-                if i == 0 or j == 0:
-                    dp[i][j] = 1
-                else:
-                    # The side length is 1 plus the minimum of the
-                    # three adjacent squares' side lengths.
-                    dp[i][j] = min(dp[i - 1][j], dp[i][j - 1], dp[i - 1][j - 1]) + 1
-
-                if dp[i][j] > block_width:
-                    return False
-    return True
+    # Count walls in every square one larger than the block width, using
+    # cumulative sums; a square with no walls is too wide
+    walls = np.array(subset_grid) != 0
+    side = block_width + 1
+    rows, cols = walls.shape
+    if rows < side or cols < side:
+        return True
+    wall_sums = np.zeros((rows + 1, cols + 1), dtype=int)
+    wall_sums[1:, 1:] = walls.cumsum(axis=0).cumsum(axis=1)
+    square_walls = (
+        wall_sums[side:, side:]
+        - wall_sums[:-side, side:]
+        - wall_sums[side:, :-side]
+        + wall_sums[:-side, :-side]
+    )
+    return not np.any(square_walls == 0)
 
 
 # Wrapper function to determine if adjusted rect position will result in a uniform path
@@ -206,38 +189,90 @@ def rect_gives_uniform_path(
             if my_rect_tangent.colliderect(temp_rect):
                 colliding_rects.append(coord)
 
-        # If colliding or tangent rects were detected:
-        if len(colliding_rects) > 1:
-            subset_grid = invert_maze_to_grid(
-                colliding_rects,
-                maze_width,
-                maze_height,
-                draw_image_x,
-                draw_image_y,
-                image_boundary,
-                block_width,
-            )
-    # Otherwise look at the entire set of coordinates
-    else:
+        # No colliding or tangent rects, so nothing to check
+        if len(colliding_rects) == 1:
+            return True
+
+        # Only grid the window around these blocks, with a margin of wall
+        # cells, since everything outside it is wall. The window is clipped
+        # to the maze, so its edges act as the maze edges where they meet.
+        half_width = int(block_width / 2)
+        offset_x = draw_image_x + image_boundary
+        offset_y = draw_image_y + image_boundary
+        window_left = max(
+            0, min(x for x, _ in colliding_rects) - offset_x - half_width - 1
+        )
+        window_top = max(
+            0, min(y for _, y in colliding_rects) - offset_y - half_width - 1
+        )
+        window_right = min(
+            maze_width, max(x for x, _ in colliding_rects) - offset_x + half_width + 1
+        )
+        window_bottom = min(
+            maze_height, max(y for _, y in colliding_rects) - offset_y + half_width + 1
+        )
         subset_grid = invert_maze_to_grid(
-            coords,
-            maze_width,
-            maze_height,
-            draw_image_x,
-            draw_image_y,
-            image_boundary,
+            colliding_rects,
+            window_right - window_left,
+            window_bottom - window_top,
+            offset_x + window_left,
+            offset_y + window_top,
+            0,
+            block_width,
+        )
+        return grid_gives_uniform_path(
+            subset_grid,
+            window_right - window_left,
+            window_bottom - window_top,
             block_width,
         )
 
-    if not my_rect or len(colliding_rects) > 1:
-        # Check if rectangular regions exist which exceed block width
-        overlayed_squares_check = overlayed_squares_legal(subset_grid, block_width)
-        # Check diagonal dimensions between edges if the first check passed
-        if overlayed_squares_check:
-            return edge_diagonals_legal(
-                subset_grid, maze_width, maze_height, block_width
-            )
-        return False
+    # Otherwise look at the entire set of coordinates
+    subset_grid = invert_maze_to_grid(
+        coords,
+        maze_width,
+        maze_height,
+        draw_image_x,
+        draw_image_y,
+        image_boundary,
+        block_width,
+    )
+    return grid_gives_uniform_path(subset_grid, maze_width, maze_height, block_width)
 
-    # No colliding or tangent rects, so nothing to check
-    return True
+
+# Function to determine if a maze grid has a uniform path
+def grid_gives_uniform_path(maze_grid, maze_width, maze_height, block_width):
+    # Check if rectangular regions exist which exceed block width
+    overlayed_squares_check = overlayed_squares_legal(maze_grid, block_width)
+    # Check diagonal dimensions between edges if the first check passed
+    if overlayed_squares_check:
+        return edge_diagonals_legal(maze_grid, maze_width, maze_height, block_width)
+    return False
+
+
+# Function to determine if a maze grid still has a uniform path after the
+# cells in the given rows and columns changed. Only squares and diagonals
+# within a block width of the change could differ, so only that window is
+# checked.
+def grid_window_gives_uniform_path(
+    maze_grid, maze_width, maze_height, block_width, rows, cols
+):
+    row_min = max(0, rows.start - block_width)
+    row_max = min(maze_height, rows.stop + block_width)
+    col_min = max(0, cols.start - block_width)
+    col_max = min(maze_width, cols.stop + block_width)
+
+    # Check if rectangular regions exist which exceed block width
+    window_grid = [row[col_min:col_max] for row in maze_grid[row_min:row_max]]
+    overlayed_squares_check = overlayed_squares_legal(window_grid, block_width)
+    # Check diagonal dimensions between edges if the first check passed
+    if overlayed_squares_check:
+        return edge_diagonals_within_legal(
+            maze_grid,
+            maze_width,
+            maze_height,
+            block_width,
+            range(row_min, row_max),
+            range(col_min, col_max),
+        )
+    return False
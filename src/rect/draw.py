@@ -2,28 +2,47 @@ import pygame
 import time
 from settings import config as cfg
 from rect.utils import define_rect, shift_rect_to_divisible_pos
-from builder.utils import scale_coords
+from builder.utils import scale_coord
 from path.utils import (
     rect_within_boundary,
     rect_gives_uniform_path,
 )
 
 
-# Function to draw square onto the screen
+# Function to draw square onto the screen, saving its rect so the screen
+# is updated later along with any other squares drawn in the same frame
 def draw_square(my_rect, screen, selected_color, dirty_rects):
     draw_rect = pygame.draw.rect(screen, selected_color, my_rect)
 
     dirty_rects.append(draw_rect)
 
-    # Update necessary portion of the screen
-    pygame.display.update(dirty_rects)
-    dirty_rects.clear()
+
+# Function to update the portions of the screen drawn since the last update,
+# in a single call with overlapping rects merged
+def update_dirty_rects(dirty_rects):
+    if dirty_rects:
+        pygame.display.update(merge_rects(dirty_rects))
+        dirty_rects.clear()
+
+
+# Function to merge overlapping rects into their union
+def merge_rects(rects):
+    merged_rects = []
+    for rect in rects:
+        merged_rect = pygame.Rect(rect)
+        index = merged_rect.collidelist(merged_rects)
+        while index != -1:
+            merged_rect.union_ip(merged_rects.pop(index))
+            index = merged_rect.collidelist(merged_rects)
+        merged_rects.append(merged_rect)
+    return merged_rects
 
 
 # Function to choose and draw location of asset for level builder
 def draw_asset(
     asset_coords,
     chosen_coords,
+    occupancy_grid,
     dirty_rects,
     screen,
     draw_image_x,
@@ -64,12 +83,12 @@ def draw_asset(
         increment += min_block_spacing
 
     # Check if any interpolatable positions exist in coordinates
-    vert_interp = not set(rects_above).isdisjoint(set(chosen_coords)) and not set(
-        rects_below
-    ).isdisjoint(set(chosen_coords))
-    horz_interp = not set(rects_left).isdisjoint(set(chosen_coords)) and not set(
-        rects_right
-    ).isdisjoint(set(chosen_coords))
+    vert_interp = any(coord in chosen_coords for coord in rects_above) and any(
+        coord in chosen_coords for coord in rects_below
+    )
+    horz_interp = any(coord in chosen_coords for coord in rects_left) and any(
+        coord in chosen_coords for coord in rects_right
+    )
 
     # Check for collision with other assets
     asset_collision = False
@@ -81,11 +100,7 @@ def draw_asset(
 
     # Check if path legal (since interpolated position may be within a wall)
     # Coarsen inputs prior to checking maze grid to optimize runtime
-    coords_scaled = scale_coords(chosen_coords, image_boundary)
-    new_center = (
-        int((my_rect.center[0] - cfg.DRAW_IMAGE_X - image_boundary) / cfg.SCALE_FACTOR),
-        int((my_rect.center[1] - cfg.DRAW_IMAGE_Y - image_boundary) / cfg.SCALE_FACTOR),
-    )
+    new_center = scale_coord(my_rect.center, image_boundary)
     my_rect_scaled = define_rect(new_center, cfg.BLOCK_WIDTH)
 
     legal_path_position = False
@@ -97,7 +112,7 @@ def draw_asset(
         maze_width,
         maze_height,
     ) and rect_gives_uniform_path(
-        coords_scaled,
+        occupancy_grid.get_tangent_centers(new_center),
         my_rect_scaled,
         cfg.MAZE_WIDTH,
         cfg.MAZE_HEIGHT,
@@ -112,18 +127,16 @@ def draw_asset(
     if legal_path_position and not asset_collision and (
         my_rect.center in chosen_coords or vert_interp or horz_interp
     ):
-        # Create square with outer boundary of appropriate color,
-        # and letter inside
-        draw_square(my_rect, screen, selected_color, dirty_rects)
-        inner_rect = define_rect(my_rect.center, int(block_width * 0.8))
-        draw_square(inner_rect, screen, black, dirty_rects)
-
-        # Draw letter inside center of box
-        text_surface = font.render(letter, True, selected_color)
-        text_rect = text_surface.get_rect()
-        text_rect.center = my_rect.center
-        screen.blit(text_surface, text_rect)
-        pygame.display.update(text_rect)
+        draw_asset_marker(
+            my_rect.center,
+            block_width,
+            letter,
+            selected_color,
+            black,
+            font,
+            screen,
+            dirty_rects,
+        )
 
         # Return adjusted location of the asset after appending to list
         asset_coords.append((my_rect.center))
@@ -131,6 +144,25 @@ def draw_asset(
     return None
 
 
+# Function to draw the marker of an asset
+def draw_asset_marker(
+    center, block_width, letter, selected_color, black, font, screen, dirty_rects
+):
+    # Create square with outer boundary of appropriate color,
+    # and letter inside
+    my_rect = define_rect(center, block_width)
+    draw_square(my_rect, screen, selected_color, dirty_rects)
+    inner_rect = define_rect(my_rect.center, int(block_width * 0.8))
+    draw_square(inner_rect, screen, black, dirty_rects)
+
+    # Draw letter inside center of box
+    text_surface = font.render(letter, True, selected_color)
+    text_rect = text_surface.get_rect()
+    text_rect.center = my_rect.center
+    screen.blit(text_surface, text_rect)
+    dirty_rects.append(text_rect)
+
+
 # Function to draw maze walls
 def draw_maze(
     draw_image_x,
@@ -169,6 +201,7 @@ def draw_maze(
         if time_delay > 0:
             # Pause to create an old-school block-by-block tracing of the level,
             # and gives player a moment to recover from previous level
+            update_dirty_rects(dirty_rects)
             time.sleep(time_delay)
 
         # Quit draw if key pressed
@@ -197,4 +230,5 @@ def draw_maze(
             )
             my_rect = define_rect(shifted_coord, int(block_width / 12))
             draw_square(my_rect, screen, dot_color, dirty_rects)
+    update_dirty_rects(dirty_rects)
     return exit_key_selected
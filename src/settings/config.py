@@ -5,6 +5,9 @@ DIRS["settings"] = "../assets/settings/"
 DIRS["sounds"] = "../assets/sounds/"
 DIRS["levels"] = "../assets/levels/"
 DIRS["title"] = "../assets/title/"
+DIRS["cache"] = "../cache/images/"
+DIRS["atlas"] = "../assets/atlas/"
+DIRS["autosave"] = "../cache/autosave/"
 
 # Filenames
 FILES = {}
@@ -15,12 +18,23 @@ FILES["asset_coordinates"] = "level_asset_coordinates.csv"
 FILES["metadata"] = "level_metadata.csv"
 FILES["settings"] = "config.csv"
 FILES["grid"] = "level_grid.txt"
+FILES["atlas_image"] = "sprite_atlas.png"
+FILES["atlas_index"] = "sprite_atlas.csv"
+FILES["autosave_journal"] = "builder_journal.bin"
+FILES["autosave_snapshot"] = "builder_snapshot.bin"
 
 # User config, maze fidelity, screen dimensions
-MAZE_FIDELITY_OPTS = ["very coarse", "coarse", "normal", "fine"]
-MAZE_FIDELITY_FACTORS = [8, 4, 2, 1]
+MAZE_FIDELITY_OPTS = ["very coarse", "coarse", "normal", "fine", "auto"]
+MAZE_FIDELITY_FACTORS = [8, 4, 2, 1, None]
 WIDTH, HEIGHT = (1600, 900)
 
+# Auto maze fidelity: starting from the finest option (or the option last
+# chosen), the maze is made coarser from the next level whenever the given
+# percentile of frame time over a window of seconds exceeds the game tick
+AUTO_FIDELITY_SECONDS = 2
+AUTO_FIDELITY_PERCENTILE = 0.9
+AUTO_FIDELITY_TOLERANCE = 1.0
+
 # Define maze properties
 MAZE_WIDTH = 256
 MAZE_HEIGHT = 192
@@ -33,10 +47,27 @@ IMAGE_BOUNDARY = 4
 # Scale variables
 SCALE_FACTOR = 4
 
+# Number of images per row of the sprite atlas
+ATLAS_COLUMNS = 8
+
+# Flag to draw the game's maze and sprites offscreen at native maze resolution
+# with unscaled images, then upscale by SCALE_FACTOR once per frame
+NATIVE_RENDER = False
+
+# Level builder autosave: seconds between syncs of journaled edits to disk,
+# and number of edits after which a snapshot of the maze replaces the journal
+AUTOSAVE_SYNC_SECONDS = 1.0
+AUTOSAVE_SNAPSHOT_EDITS = 500
+
 # Max enemies in level builder
-MAX_CORN = 8
-MAX_TOMATO = 6
-MAX_PUMPKIN = 4
+MAX_CORN = 16
+MAX_TOMATO = 12
+MAX_PUMPKIN = 8
+
+# Minimum number of enemies in a level for them to be advanced together as
+# a swarm with batched array updates (None to always update one at a time).
+# Per-enemy updates are faster for fewer, as timed by benchmark_swarm.py.
+ENEMY_SWARM_MIN = 30
 
 # Define colors
 COLORS = {}
@@ -61,7 +92,7 @@ COLORS["ltgray"] = (212, 212, 212)
 DRAW_STRINGS = [
     "Left click or use arrow keys to",
     "draw maze. Right click to erase.",
-    "X to undo last drawn position.",
+    "X to undo, Y to redo an edit.",
     "",
     "W to cycle wall color",
     "A to end maze and place assets",
@@ -79,10 +110,17 @@ LOAD_TEXT = "Press Escape to import an existing maze"
 ASSET_STRINGS = [
     "Key (see list below) to place",
     "asset at cursor location",
-    "Right click to undo",
+    "Right click to undo, Y to redo",
     "C to export maze to files",
 ]
 
+# Level export progress text
+EXPORT_TEXT = {}
+EXPORT_TEXT["progress"] = "Exporting file {} of {}"
+EXPORT_TEXT["done"] = "Export complete"
+EXPORT_TEXT["failed"] = "Export failed, see console"
+EXPORT_TEXT["busy"] = "Previous export still in progress"
+
 # Level info text
 INFO_STRINGS = [
     "Level: " "",
@@ -180,6 +218,7 @@ TEXT_LOC["maze_load"] = (275, 850)
 TEXT_LOC["place_assets_row_1"] = (1120, 100, 40)
 TEXT_LOC["place_assets"] = (1120, 100, 50)
 TEXT_LOC["assets"] = (1130, 400, 30)
+TEXT_LOC["export_progress"] = (1120, 310)
 # Title screen text
 TEXT_LOC["animation_info"] = (1140, 50, 50)
 TEXT_LOC["title"] = (275, 200)
@@ -210,9 +249,10 @@ BLACK_RECTS["animation"] = (1130, 240, 300, 50)
 BLACK_RECTS["assets"] = (1110, 390, 370, 260)
 WHITE_RECTS = {}
 WHITE_RECTS["assets"] = (1120, 50, WIDTH - 1140, HEIGHT - 50)
+WHITE_RECTS["export_progress"] = (1120, 310, WIDTH - 1140, 40)
 WHITE_RECTS["speed"] = (1450, 350, 400, 100)
-WHITE_RECTS["corn"] = (1170, 780, BLOCK_WIDTH * SCALE_FACTOR)
-WHITE_RECTS["tomato"] = (1310, 780, BLOCK_WIDTH * SCALE_FACTOR)
+WHITE_RECTS["corn"] = (1178, 780, BLOCK_WIDTH * SCALE_FACTOR)
+WHITE_RECTS["tomato"] = (1318, 780, BLOCK_WIDTH * SCALE_FACTOR)
 WHITE_RECTS["pumpkin"] = (1450, 780, BLOCK_WIDTH * SCALE_FACTOR)
 WHITE_RECTS["maze_load"] = (250, 850, 700, 100)
 
@@ -248,6 +288,10 @@ MSG_STRING["asset_space"] = (
     "Path area must equal at least 8 full squares.\n\n"
     "Click OK then click back onto Level Builder window."
 )
+MSG_STRING["recover_autosave"] = (
+    "A maze autosaved by a previous session was found.\n\n"
+    "Click Yes to recover it, or No to start a new maze."
+)
 MSG_STRING["maze_folder"] = (
     "Please create a new folder"
     " at the location shown in the next dialog box, then select that "
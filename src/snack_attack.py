@@ -5,34 +5,57 @@ from settings import config as cfg
 from title.intro import run_title_screen
 from rect.draw import draw_maze
 from asset.player import Player
-from fileio.load import (
-    read_csv_dict,
-    read_csv_path,
-)
+from asset.swarm import EnemySwarm
+from asset.registry import EnemyRegistry
+from fileio.load import read_csv_dict
 from game.start import load_settings, load_resources, game_init, Flags
 from game.input import process_input
-from game.level import print_level_text, create_grid, get_level_data, set_maze_flags
-from game.assets import init_items, init_enemies, set_asset_flags
+from game.fidelity import (
+    FidelityMonitor,
+    get_coarser_maze_factor,
+    save_auto_fidelity,
+)
+from game.level import (
+    load_level_files,
+    colorize_images,
+    print_level_text,
+    create_grid,
+    get_level_data,
+    set_maze_flags,
+)
+from game.assets import (
+    init_items,
+    init_enemies,
+    init_spatial_hashes,
+    set_asset_flags,
+)
 from game.play import (
+    SpritePool,
+    Scheduler,
     reset_actors,
-    determine_spawn,
+    schedule_spawns,
+    spawn_enemies,
     init_projectile,
     move_sprites,
     move_to_exit,
     init_blast,
+    get_collision_candidates,
     check_enemy_collision,
     remove_items,
     init_exit,
     animate_exit,
     draw_sprites,
+    init_native_render,
     screen_update,
     check_game_tick,
     player_collide_pause,
-    exit_level,
+    handle_timed_events,
+    get_next_level_index,
     end_game,
     pause_game,
 )
 from path.pathfind import create_graph
+from path.sightline import SightlineIndex
 
 # Initialize pygame, screen, and starting variables
 (
@@ -47,7 +70,6 @@ from path.pathfind import create_graph
     score,
     lives,
     game_time,
-    start_time,
     pause_start,
 ) = game_init()
 
@@ -57,10 +79,28 @@ images, sounds, levels, level_index = load_resources()
 # Game loop flags and variables
 flags = Flags()
 
+# Projectiles and blasts are recycled rather than rebuilt for each shot
+sprite_pool = SpritePool()
+
+# Timed pauses are waited out by the game loop rather than by sleeping,
+# and the next level's files may be read during the pause before it
+scheduler = Scheduler()
+prefetched_level = None
+
+# Enemy spawns are events due at set times, delayed while the game is paused
+spawn_scheduler = Scheduler()
+
 
 while flags.running:
+    # Handle pauses and other timed events which have come due, holding
+    # them while the game is paused
+    if not flags.paused:
+        flags, level_index = handle_timed_events(
+            scheduler, flags, level_index, levels, game_time
+        )
+
     # Show game intro screen
-    if flags.game_intro:
+    if flags.game_intro and not scheduler.is_pausing():
         flags = Flags()
         flags.running = run_title_screen(
             flags,
@@ -82,6 +122,12 @@ while flags.running:
         # Scale game tick based on animation smoothness
         game_tick = cfg.GAME_TICK * maze_factor
 
+        # In auto fidelity, monitor frame times to coarsen the maze if needed
+        fidelity_monitor = None
+        next_maze_factor = None
+        if cfg.MAZE_FIDELITY_FACTORS[maze_fidelity_index] is None:
+            fidelity_monitor = FidelityMonitor(game_tick)
+
         if flags.running:
             flags.maze_draw = True
         else:
@@ -96,7 +142,6 @@ while flags.running:
             key_order,
             controls_option,
             flags,
-            start_time,
             pause_start,
             pause_delta,
         ) = process_input(
@@ -112,15 +157,29 @@ while flags.running:
             screen,
             sounds,
             game_time,
-            start_time,
             pause_start,
+            scheduler,
+            spawn_scheduler,
         )
 
     # Draw maze and instructions on screen
     if flags.maze_draw:
-        maze_assets = read_csv_dict(levels[level_index].get("assets"))
-        maze_metadata = read_csv_dict(levels[level_index].get("metadata"))[0]
-        maze_path = read_csv_path(levels[level_index].get("path"))
+        # Cancel pauses of the previous level, such as when skipping it
+        scheduler.clear()
+
+        # Apply a coarser maze factor chosen by auto fidelity
+        if next_maze_factor:
+            maze_factor = next_maze_factor
+            game_tick = cfg.GAME_TICK * maze_factor
+            fidelity_monitor = FidelityMonitor(game_tick)
+            next_maze_factor = None
+        if prefetched_level and prefetched_level[0] == level_index:
+            maze_assets, maze_metadata, maze_path = prefetched_level[1]
+        else:
+            maze_assets, maze_metadata, maze_path = load_level_files(
+                levels, level_index
+            )
+        prefetched_level = None
 
         # Perform clearing of screen to remove old maze and clear up memory
         screen.fill(cfg.COLORS["black"])
@@ -151,6 +210,9 @@ while flags.running:
             maze_width, maze_height, block_width, maze_factor, maze_path
         )
 
+        # Index straight path segments for enemy sightline checks
+        sightline_index = SightlineIndex(maze_grid)
+
         # Create maze graph using chosen coordinates
         maze_graph, maze_graph_coords = create_graph(
             maze_path, cfg.SCALE_FACTOR, cfg.BLOCK_WIDTH
@@ -161,6 +223,11 @@ while flags.running:
         rect_area = pygame.Rect(0, 0, cfg.WIDTH, cfg.HEIGHT)
         temp_surf = screen.subsurface(rect_area)
         area_surf = temp_surf.copy()
+        native_render = None
+        if cfg.NATIVE_RENDER:
+            native_render = init_native_render(
+                screen, area_surf, maze_width, maze_height, image_boundary
+            )
 
         # Determine level characteristics
         (
@@ -184,20 +251,7 @@ while flags.running:
             sprite_metadata["first_color"] = "blue"
             sprite_metadata["second_color"] = "red"
 
-        colorized_images = {}
-        for image in images:
-            image_copy = images[image].copy()
-            pixel_array = pygame.PixelArray(image_copy)
-            pixel_array.replace(cfg.COLORS["blue"], cfg.COLORS["replace_blue"])
-            pixel_array.replace(cfg.COLORS["red"], cfg.COLORS["replace_red"])
-            pixel_array.replace(
-                cfg.COLORS["replace_blue"], cfg.COLORS[sprite_metadata["first_color"]]
-            )
-            pixel_array.replace(
-                cfg.COLORS["replace_red"], cfg.COLORS[sprite_metadata["second_color"]]
-            )
-            del pixel_array
-            colorized_images[image] = image_copy
+        colorized_images = colorize_images(images, sprite_metadata)
 
     # Create Sprite objects
     elif flags.create_sprites:
@@ -209,6 +263,7 @@ while flags.running:
         if items:
             for key, value in items.items():
                 barrier_sprites[key] = value
+                sightline_index.add_barrier(key, value)
 
         # Initialize player
         player = Player(
@@ -257,30 +312,67 @@ while flags.running:
             True,
         )
 
+        # Track alive and active enemies as they spawn and are destroyed
+        enemy_registry = EnemyRegistry(corns, tomatoes, pumpkins)
+        all_enemies = enemy_registry.all_enemies
+
+        # Advance enemies together as a swarm if the level is crowded
+        enemy_swarm = None
+        if cfg.ENEMY_SWARM_MIN is not None and len(all_enemies) >= cfg.ENEMY_SWARM_MIN:
+            enemy_swarm = EnemySwarm(
+                all_enemies, maze_grid, sightline_index, maze_factor, maze_graph_coords
+            )
+
+        # Broadphase for enemy, item, and exit collisions
+        spatial_hashes = init_spatial_hashes(
+            all_enemies, barrier_sprites, block_width, maze_factor
+        )
+
         # Update screen, set flags and variables
-        start_time, projectile, blast, spawned_enemies, flags = set_asset_flags(flags)
+        projectile, blast, flags = set_asset_flags(flags)
+        schedule_spawns(spawn_scheduler, seconds_to_spawn, len(all_enemies))
+
+    # Show pause text, including during timed pauses, which wait until the
+    # game is unpaused
+    elif flags.paused:
+        flags = pause_game(flags, fonts, screen)
+
+    # Wait out timed pauses while still pumping events
+    elif scheduler.is_pausing():
+        # Read the next level's files while the closed door is shown
+        if scheduler.is_scheduled("door_closed") and not prefetched_level:
+            next_level_index = get_next_level_index(level_index, levels)
+            prefetched_level = (
+                next_level_index,
+                load_level_files(levels, next_level_index),
+            )
+        check_game_tick(game_time, game_tick)
 
     # Primary game loop
     elif flags.rungame and not flags.paused:
+        if fidelity_monitor:
+            fidelity_monitor.start_frame()
+
         # Clear images and Rects for screen blit
         sprite_image_data = []
 
-        # Get alive enemies
-        alive_corns = [corn for corn in corns if not corn.is_destroyed()]
-        alive_tomatoes = [tomato for tomato in tomatoes if not tomato.is_destroyed()]
-        alive_pumpkins = [pumpkin for pumpkin in pumpkins if not pumpkin.is_destroyed()]
-
         if player.can_spawn():
-            start_time, spawned_enemies, projectile, blast, flow_field = reset_actors(
-                flags, player, alive_corns, alive_tomatoes, alive_pumpkins, asset_coord
+            projectile, blast, flow_field = reset_actors(
+                flags,
+                player,
+                enemy_registry.alive_enemies,
+                asset_coord,
+                projectile,
+                blast,
+                sprite_pool,
+                spawn_scheduler,
+                seconds_to_spawn,
             )
+            if enemy_swarm:
+                enemy_swarm.load_views()
 
         # Determine whether to spawn enemies based on time and their state
-        alive_enemies = alive_corns + alive_tomatoes + alive_pumpkins
-        spawned_enemies = determine_spawn(
-            start_time, spawned_enemies, seconds_to_spawn, alive_enemies
-        )
-        active_enemies = [enemy for enemy in alive_enemies if enemy.can_spawn()]
+        spawn_enemies(spawn_scheduler, enemy_registry.alive_enemies)
 
         # Player movement input
         keys = pygame.key.get_pressed()
@@ -301,6 +393,7 @@ while flags.running:
                 sounds,
                 pixels_per_second,
                 None,
+                sprite_pool,
             )
 
         # Move player, projectiles, and enemies
@@ -308,7 +401,7 @@ while flags.running:
             flags, flow_field = move_sprites(
                 player,
                 projectile,
-                active_enemies,
+                enemy_registry.active_enemies,
                 flags,
                 maze_grid,
                 game_tick,
@@ -317,6 +410,9 @@ while flags.running:
                 maze_factor,
                 flow_field,
                 barrier_sprites,
+                sightline_index,
+                enemy_swarm,
+                spatial_hashes,
             )
         else:
             # If player not coincident with exit and moving towards it,
@@ -343,37 +439,43 @@ while flags.running:
                 block_width,
                 maze_factor,
                 None,
+                sprite_pool,
             )
         elif blast and not blast.is_animating():
             # Remove blasts which have finished animating
+            sprite_pool.release(blast)
             blast = []
             flags.screen_change = True
 
         # Detect enemy collision with player and projectile
-        for enemy in active_enemies:
+        for enemy in get_collision_candidates(spatial_hashes, player, projectile):
             if flags.exit_created:
                 exit_sprite = exit
             else:
                 exit_sprite = None
-            lives, score, spawned_enemies, start_time, flags = check_enemy_collision(
+            lives, score, flags = check_enemy_collision(
                 enemy,
                 player,
                 projectile,
                 flags,
                 sounds,
                 colorized_images,
-                spawned_enemies,
-                seconds_to_spawn,
                 score,
                 lives,
-                start_time,
             )
 
-        all_enemies = corns + tomatoes + pumpkins
         if not player.can_spawn():
             # Remove items if appropriate
             items, flags, score, all_destroyed, barrier_sprites = remove_items(
-                all_enemies, flags, items, player, score, sounds, barrier_sprites
+                enemy_registry,
+                flags,
+                items,
+                player,
+                score,
+                sounds,
+                barrier_sprites,
+                spatial_hashes,
+                sightline_index,
             )
 
             # If no more items, draw exit
@@ -394,18 +496,16 @@ while flags.running:
         if flags.exit_created:
             if "exit" not in barrier_sprites:
                 enemy_collide_exit = False
-                for enemy in all_enemies:
+                for enemy in spatial_hashes["enemies"].query(exit.hitbox_rect):
                     if enemy.collide_check(exit):
                         enemy_collide_exit = True
                         break
                 if not enemy_collide_exit:
                     barrier_sprites["exit"] = exit
+                    spatial_hashes["barriers"].insert(exit)
+                    sightline_index.add_barrier("exit", exit)
 
-            sprite_image_data.append(
-                exit.draw(
-                    cfg.DRAW_IMAGE_X, cfg.DRAW_IMAGE_Y, image_boundary, maze_factor
-                )
-            )
+            exit.update_animation()
             # Proceed to next level if collision with exit
             if player.collide_check(exit):
                 flags = animate_exit(flags, exit, colorized_images)
@@ -417,7 +517,7 @@ while flags.running:
             sprite_image_data,
             flags,
             items,
-            all_enemies,
+            enemy_registry.all_enemies,
             player,
             projectile,
             blast,
@@ -425,6 +525,7 @@ while flags.running:
             image_boundary,
             maze_factor,
             pause_delta,
+            native_render,
         )
 
         # Update screen if necessasry
@@ -438,25 +539,33 @@ while flags.running:
                 controls_option,
                 sprite_image_data,
                 flags,
+                native_render,
             )
 
+        # In auto fidelity, if the game tick is not sustained, save and use
+        # the next coarser maze factor from the next maze drawn
+        if fidelity_monitor and fidelity_monitor.end_frame():
+            next_maze_factor = get_coarser_maze_factor(maze_factor)
+            fidelity_monitor = None
+            if next_maze_factor:
+                save_auto_fidelity(next_maze_factor)
+
         # Check game tick versus actual time
         check_game_tick(game_time, game_tick)
 
         # Brief pause once the player has collided with an enemy
         if player.can_spawn():
-            player_collide_pause(lives, sounds, game_time)
+            player_collide_pause(lives, sounds, scheduler)
 
-        # Change to the next level if door closing animation finished
+        # Change to the next level after a pause, if door closing animation finished
         if flags.exit_closing and not exit.is_animating():
-            flags, level_index = exit_level(level_index, levels, flags)
+            scheduler.schedule_pause("door_closed", cfg.PAUSES["door_closed"])
 
         # Restart game if lives expended
         if lives < 0:
-            flags, level_index, score, lives = end_game(flags, fonts, screen, sounds)
-
-    elif flags.paused:
-        flags = pause_game(flags, fonts, screen)
+            flags, level_index, score, lives = end_game(
+                flags, fonts, screen, sounds, scheduler
+            )
 
 # Quit
 pygame.quit()
@@ -1,5 +1,4 @@
 import ast
-import time
 import pygame
 from settings import config as cfg
 from rect.draw import draw_maze
@@ -10,13 +9,17 @@ from fileio.load import (
     read_csv_dict,
     read_csv_path,
 )
-from game.start import load_settings
+from game.start import load_settings, get_maze_factor
 from game.level import get_level_data
 from game.assets import init_items, init_enemies
 from game.play import (
-    determine_spawn,
+    Scheduler,
+    schedule_spawns,
+    spawn_enemies,
     move_sprites,
     draw_sprites,
+    init_native_render,
+    blit_sprites,
     check_game_tick,
 )
 
@@ -71,7 +74,6 @@ def process_title_input(
                 maze_fidelity_index = 0
             else:
                 maze_fidelity_index += 1
-            maze_factor = cfg.MAZE_FIDELITY_FACTORS[maze_fidelity_index]
             maze_fidelity = cfg.MAZE_FIDELITY_OPTS[maze_fidelity_index]
 
             # Load then re-export settings file
@@ -79,6 +81,10 @@ def process_title_input(
             for key, value in settings[0].items():
                 if key == "maze_fidelity":
                     settings[0][key] = maze_fidelity
+            # Selecting auto restarts its choice from the finest fidelity
+            if cfg.MAZE_FIDELITY_FACTORS[maze_fidelity_index] is None:
+                settings[0].pop("auto_fidelity", None)
+            maze_factor = get_maze_factor(maze_fidelity_index, settings[0])
             export_settings(settings[0])
             move_one_file(cfg.FILES["settings"], ".", cfg.DIRS["settings"])
 
@@ -124,7 +130,7 @@ def print_intro_text(fonts, screen):
 
 # Function to update screen
 def update_title_screen(
-    flags, screen, area_surf, fonts, maze_fidelity, sprite_image_data
+    flags, screen, area_surf, fonts, maze_fidelity, sprite_image_data, native_render
 ):
     # Clear screen and re-draw background
     screen.fill(cfg.COLORS["black"])
@@ -144,8 +150,7 @@ def update_title_screen(
         screen.blit(text_surface, (loc[0], loc[1] + row * loc[2]))
 
     # Print sprites
-    for item in sprite_image_data:
-        screen.blit(item[0], item[1])
+    blit_sprites(screen, sprite_image_data, native_render)
 
     pygame.display.flip()
     flags.screen_change = False
@@ -228,6 +233,11 @@ def run_title_screen(
             rect_area = pygame.Rect(0, 0, cfg.WIDTH, cfg.HEIGHT)
             temp_surf = screen.subsurface(rect_area)
             area_surf = temp_surf.copy()
+            native_render = None
+            if cfg.NATIVE_RENDER:
+                native_render = init_native_render(
+                    screen, area_surf, maze_width, maze_height, image_boundary
+                )
 
             # Set flags
             flags.update_animation_speed = True
@@ -250,7 +260,7 @@ def run_title_screen(
             ) = get_level_data(flags, maze_factor, maze_metadata, maze_assets)
 
             flags = update_title_screen(
-                flags, screen, area_surf, fonts, maze_fidelity, []
+                flags, screen, area_surf, fonts, maze_fidelity, [], native_render
             )
 
             # Print animation options info
@@ -302,11 +312,15 @@ def run_title_screen(
 
             # Update screen, set flags and variables
             game_time = pygame.time.Clock()
-            start_time = time.time()
+            spawn_scheduler = Scheduler()
+            schedule_spawns(
+                spawn_scheduler,
+                seconds_to_spawn,
+                len(corns) + len(tomatoes) + len(pumpkins),
+            )
             flags.rungame = True
             flags.screen_change = True
             flags.create_sprites = False
-            spawned_enemies = 0
         # Primary game loop
         elif flags.rungame:
             # Clear images and Rects for screen blit
@@ -323,9 +337,7 @@ def run_title_screen(
 
             # Determine whether to spawn enemies based on time and their state
             alive_enemies = alive_corns + alive_tomatoes + alive_pumpkins
-            spawned_enemies = determine_spawn(
-                start_time, spawned_enemies, seconds_to_spawn, alive_enemies
-            )
+            spawn_enemies(spawn_scheduler, alive_enemies)
             active_enemies = [enemy for enemy in alive_enemies if enemy.can_spawn()]
 
             # Move player, projectiles, and enemies
@@ -341,6 +353,9 @@ def run_title_screen(
                 None,
                 None,
                 [],
+                None,
+                None,
+                None,
             )
 
             # Draw item and enemy sprites
@@ -356,12 +371,19 @@ def run_title_screen(
                 image_boundary,
                 maze_factor,
                 0,
+                native_render,
             )
 
             # Update screen if necessasry
             if flags.screen_change:
                 flags = update_title_screen(
-                    flags, screen, area_surf, fonts, maze_fidelity, sprite_image_data
+                    flags,
+                    screen,
+                    area_surf,
+                    fonts,
+                    maze_fidelity,
+                    sprite_image_data,
+                    native_render,
                 )
 
             # Check game tick versus actual time
@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from settings import config as cfg
+from fileio.load import get_levels
+from game.validate import validate_level
+
+# Check every level in a directory (the game's levels by default, or the
+# first argument) without opening the game or builder. Levels are validated
+# in parallel across processes, with the time taken for each reported.
+if __name__ == "__main__":
+    levels_directory = sys.argv[1] if len(sys.argv) > 1 else cfg.DIRS["levels"]
+    if not os.path.isdir(levels_directory):
+        sys.exit(f"Levels directory not found: {levels_directory}")
+    levels = get_levels(levels_directory)
+    if not levels:
+        sys.exit(f"No levels found in {levels_directory}")
+
+    start_time = time.perf_counter()
+    num_failed = 0
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for folder, errors, seconds in executor.map(validate_level, levels):
+            status = "FAIL" if errors else "OK"
+            print(f"{status:4} {folder} ({seconds * 1000:.1f} ms)")
+            for error in errors:
+                print(f"     - {error}")
+            num_failed += bool(errors)
+
+    print(
+        f"{len(levels) - num_failed} of {len(levels)} levels valid "
+        f"in {time.perf_counter() - start_time:.2f} s"
+    )
+    sys.exit(1 if num_failed else 0)